@@ -2,3 +2,15 @@ import os
 
 db_file = os.environ["PYROBOTS_DBFILE"]
 db_config = {"provider": "sqlite", "filename": db_file, "create_db": True}
+
+# Pragmas set on every connection. In WAL mode readers keep reading while
+# match results are written, and writers wait up to `busy_timeout` ms for
+# each other instead of failing with "database is locked".
+db_pragmas = {
+    "journal_mode": os.environ.get("PYROBOTS_DB_JOURNAL_MODE", "wal"),
+    "synchronous": os.environ.get("PYROBOTS_DB_SYNCHRONOUS", "normal"),
+    "busy_timeout": int(os.environ.get("PYROBOTS_DB_BUSY_TIMEOUT", "5000")),
+    # Negative sizes are in KiB
+    "cache_size": int(os.environ.get("PYROBOTS_DB_CACHE_SIZE", "-16000")),
+    "mmap_size": int(os.environ.get("PYROBOTS_DB_MMAP_SIZE", "67108864")),
+}
@@ -1,3 +1,5 @@
+import os
+
 from app.util.assets import ASSETS_MODULE
 
 ROBOT_MODULE = f"{ASSETS_MODULE}.robots.code"
@@ -10,6 +12,7 @@ ACC_FACTOR = 10  # TODO: express in terms of DELTA_TIME as (m/s^2)
 
 MISSILE_VEL = 100 * DELTA_VEL
 MISSILE_D_DELTA = MISSILE_VEL * DELTA_TIME
+MISSILE_MAX_DIST = 700
 
 # Damage
 MAX_DMG = 100
@@ -18,11 +21,32 @@ FAR_EXPLOSION_DMG = 3
 MID_EXPLOSION_DMG = 5
 NEAR_EXPLOSION_DMG = 10
 
+# Explosion damage bands, as distances from the missile
+NEAR_EXPLOSION_RADIUS = 5
+MID_EXPLOSION_RADIUS = 20
+FAR_EXPLOSION_RADIUS = 40
+
 # Robot things
 CANNON_COOLDOWN = 10
 ROBOT_DIAMETER = 20
 
 BOARD_SZ = 1000
+# Side of the cells of the spatial index over the board, large enough for
+# collision and explosion lookups to only look at neighbouring cells
+GRID_CELL_SZ = max(ROBOT_DIAMETER, FAR_EXPLOSION_RADIUS)
 
 RESPOND_TIMEOUT = 10e-3
 INIT_TIMEOUT = 10e-3
+
+# Processes that share the games of a match, one runs them all in-process
+MATCH_PROCS = int(os.environ.get("PYROBOTS_MATCH_PROCS", "1"))
+# Games played between checkpoints of the counters of a match
+CHECKPOINT_GAMES = int(os.environ.get("PYROBOTS_CHECKPOINT_GAMES", "10"))
+# Rounds a game must stay unchanged to end as a draw, 0 never ends games early
+STALEMATE_ROUNDS = int(os.environ.get("PYROBOTS_STALEMATE_ROUNDS", "100"))
+# Distinct robot codes kept compiled by `app.game.loader`
+ROBOT_CACHE_SIZE = int(os.environ.get("PYROBOTS_ROBOT_CACHE", "128"))
+# How the processes of match pools start, see `app.game.host`
+POOL_START_METHOD = os.environ.get("PYROBOTS_POOL_START", "forkserver")
+# Whether matches time the phases of their games, see `app.game.timing`
+MATCH_TIMING = os.environ.get("PYROBOTS_MATCH_TIMING", "0") == "1"
@@ -0,0 +1,327 @@
+import random
+from typing import List
+
+import numpy as np
+
+import app.schemas.simulation as schemas
+from app.game import *
+from app.game.board import generate_init_positions
+from app.game.explosions import explosion_damage
+from app.game.recorder import Frame
+from app.game.rng import seed_worker
+from app.game.scanner import scan_robots
+from app.game.timing import skip_lap
+from app.game.worker import RobotWorker
+
+# Attributes that `RobotView` adds to robots, robot code must not touch them
+ROBOT_VIEW_VARS = {"_state", "_slot"}
+
+
+# Struct-of-arrays state of every robot and missile in an `ArrayBoard`.
+# Rows of the robot arrays are the slots of the robots in `ArrayBoard.robots`.
+class BoardState:
+    def __init__(self, n: int):
+        self.pos = np.zeros((n, 2))
+        self.dir = np.zeros(n)
+        self.current_vel = np.zeros(n)
+        self.desired_vel = np.zeros(n)
+        self.dmg = np.zeros(n, dtype=np.int64)
+        self.cooldown = np.zeros(n, dtype=np.int64)
+
+        self.m_id = np.zeros(0, dtype=np.int64)
+        self.m_sender = np.zeros(0, dtype=np.int64)
+        self.m_pos = np.zeros((0, 2))
+        self.m_dir = np.zeros((0, 2))
+        self.m_dist = np.zeros(0)
+
+    def keep_robots(self, mask):
+        self.pos = self.pos[mask]
+        self.dir = self.dir[mask]
+        self.current_vel = self.current_vel[mask]
+        self.desired_vel = self.desired_vel[mask]
+        self.dmg = self.dmg[mask]
+        self.cooldown = self.cooldown[mask]
+
+    def keep_missiles(self, mask):
+        self.m_id = self.m_id[mask]
+        self.m_sender = self.m_sender[mask]
+        self.m_pos = self.m_pos[mask]
+        self.m_dir = self.m_dir[mask]
+        self.m_dist = self.m_dist[mask]
+
+    def add_missiles(self, ids, senders, pos, dirs, dists):
+        self.m_id = np.concatenate((self.m_id, ids))
+        self.m_sender = np.concatenate((self.m_sender, senders))
+        self.m_pos = np.concatenate((self.m_pos, pos))
+        self.m_dir = np.concatenate((self.m_dir, dirs))
+        self.m_dist = np.concatenate((self.m_dist, dists))
+
+
+def _view_property(field: str, cast):
+    def get(self):
+        return cast(getattr(self._state, field)[self._slot])
+
+    def set(self, v):
+        getattr(self._state, field)[self._slot] = v
+
+    return property(get, set)
+
+
+# Mixed into robot classes so that the `Robot` API reads and writes the rows
+# of a `BoardState` instead of per-object attributes
+class RobotView:
+    def __init__(self, state: BoardState, slot: int, *args):
+        self._state = state
+        self._slot = slot
+        super().__init__(*args)
+
+    _pos = _view_property("pos", lambda p: tuple(p.tolist()))
+    _dir = _view_property("dir", float)
+    _current_vel = _view_property("current_vel", float)
+    _desired_vel = _view_property("desired_vel", float)
+    _dmg = _view_property("dmg", int)
+    _cannon_cooldown = _view_property("cooldown", int)
+
+    def _detach(self):
+        # Keep a private copy of the robot's row once it leaves the board
+        state = BoardState(1)
+        state.pos[0] = self._state.pos[self._slot]
+        state.dir[0] = self._state.dir[self._slot]
+        state.current_vel[0] = self._state.current_vel[self._slot]
+        state.desired_vel[0] = self._state.desired_vel[self._slot]
+        state.dmg[0] = self._state.dmg[self._slot]
+        state.cooldown[0] = self._state.cooldown[self._slot]
+        self._state = state
+        self._slot = 0
+
+
+# The view class of a robot class is kept in the robot class itself, so both
+# go away together once the loader drops the robot. A weak dict would not
+# let them: the view class keeps its base alive.
+def view_class(robot_class):
+    view = robot_class.__dict__.get("_array_view")
+    if view is None:
+        view = type(robot_class.__name__, (RobotView, robot_class), {})
+        robot_class._array_view = view
+    return view
+
+
+# Missiles of an `ArrayBoard`, sized like the missile dicts of `Board`
+class MissileArrays:
+    def __init__(self, state: BoardState):
+        self._state = state
+
+    def __len__(self):
+        return len(self._state.m_id)
+
+
+# Drop-in alternative to `Board` that keeps the whole game state in NumPy
+# arrays and runs the physics of every robot and missile at once
+class ArrayBoard:
+    # Seeded boards play the same game every time: `seed` gives the initial
+    # positions and the random generator of every robot
+    def __init__(
+        self, robot_classes: List, worker_factory=RobotWorker, seed: int | None = None
+    ):
+        self.robots = []
+        self.workers = {}
+        self.cur_missile = 0
+        self.state = BoardState(len(robot_classes))
+        self.missiles = MissileArrays(self.state)
+
+        rng = random if seed is None else random.Random(seed)
+        init_pos = generate_init_positions(len(robot_classes), rng)
+        # Drawn only for seeded boards, others leave the shared generator alone
+        robot_seeds = None
+        if seed is not None:
+            robot_seeds = [rng.getrandbits(64) for _ in robot_classes]
+        for i, (r_id, rc) in enumerate(robot_classes):
+            w = worker_factory()
+            try:
+                if robot_seeds is not None:
+                    seed_worker(w, robot_seeds[i])
+                r = view_class(rc)(self.state, i, r_id, i, init_pos[i])
+                w.call(INIT_TIMEOUT, r.initialize)
+                self.robots.append(r)
+                self.workers[i] = w
+            except:
+                w.close()
+
+        # Drop the rows of robots that failed to initialize
+        keep = np.zeros(len(robot_classes), dtype=bool)
+        keep[[r._slot for r in self.robots]] = True
+        self.state.keep_robots(keep)
+        self._assign_slots()
+
+    # Plays a round, calling `lap` with the name of every phase once it is
+    # played. Timed boards pass `PhaseTimes.lap`, see `enable_timing`.
+    def next_round(self, lap=skip_lap):
+        responded = self._respond()
+        lap("respond")
+        self._scan(responded)
+        lap("scan")
+        self._launch_missiles(responded)
+        self._remove_dead_robots()
+
+        self.state.keep_missiles(self.state.m_dist > 0)
+        self._advance_missiles()
+        lap("missiles")
+        self._explode_missiles()
+        lap("explosions")
+
+        self._move_robots()
+        self._remove_dead_robots()
+        lap("move")
+
+    # Returns which robots responded in time
+    def _respond(self) -> np.ndarray:
+        responded = np.zeros(len(self.robots), dtype=bool)
+        for i, r in enumerate(self.robots):
+            try:
+                self.workers[r._board_id].call(RESPOND_TIMEOUT, r.respond)
+                responded[i] = True
+            except:
+                # Timeout or exception from respond call
+                # Either way, kill offending robot
+                self.state.dmg[i] = MAX_DMG
+        return responded
+
+    def _scan(self, responded):
+        scanning = [
+            i
+            for i, r in enumerate(self.robots)
+            if responded[i] and r._scanner_params is not None
+        ]
+        scan_robots(self.robots, scanning)
+
+    def _launch_missiles(self, responded):
+        s = self.state
+        s.cooldown[responded] -= 1
+        fire = []
+        for i, r in enumerate(self.robots):
+            if not responded[i]:
+                continue
+            if s.cooldown[i] <= 0 and r._cannon_params is not None:
+                fire.append((i, r._board_id) + r._cannon_params)
+            r._cannon_params = None
+        if not fire:
+            return
+
+        slots, senders, dirs, dists = (np.array(c) for c in zip(*fire))
+        s.cooldown[slots] = CANNON_COOLDOWN
+        ids = np.arange(self.cur_missile, self.cur_missile + len(fire))
+        self.cur_missile += len(fire)
+        s.add_missiles(
+            ids,
+            senders,
+            s.pos[slots],
+            np.stack((np.cos(dirs), np.sin(dirs)), axis=1),
+            dists.astype(float),
+        )
+
+    def _advance_missiles(self):
+        s = self.state
+        step = np.minimum(s.m_dist, MISSILE_D_DELTA)
+        s.m_dist -= step
+        s.m_pos += s.m_dir * step[:, None]
+        inside = np.all((0 < s.m_pos) & (s.m_pos < BOARD_SZ), axis=1)
+        # force missiles outside the board to explode
+        s.m_dist[~inside] = 0
+
+    def _explode_missiles(self):
+        s = self.state
+        exploding = s.m_pos[s.m_dist <= 0]
+        if len(exploding) > 0 and len(s.pos) > 0:
+            s.dmg += explosion_damage(exploding, s.pos)
+
+    def _move_robots(self):
+        s = self.state
+        # Robots killed by missiles stay still, but others may crash into them
+        alive = s.dmg < MAX_DMG
+
+        s.current_vel = np.where(
+            alive,
+            np.clip(
+                s.desired_vel, s.current_vel - ACC_FACTOR, s.current_vel + ACC_FACTOR
+            ),
+            s.current_vel,
+        )
+        delta_pos = s.current_vel * (DELTA_TIME * DELTA_VEL)
+        moved = (
+            s.pos
+            + np.stack((np.cos(s.dir), np.sin(s.dir)), axis=1) * delta_pos[:, None]
+        )
+        moved[~alive] = s.pos[~alive]
+
+        radius = ROBOT_DIAMETER / 2
+        lbound = radius
+        ubound = BOARD_SZ - radius
+        clamped = np.clip(moved, lbound, ubound)
+        clamped[~alive] = s.pos[~alive]
+        hit_wall = alive & ~np.all((lbound < moved) & (moved < ubound), axis=1)
+
+        # Robots move in order and each one checks for collisions against the
+        # robots moved before it, which already had their walls checked
+        diff = moved[:, None, :] - clamped[None, :, :]
+        crash = np.hypot(diff[..., 0], diff[..., 1]) < ROBOT_DIAMETER
+        crash &= np.tri(len(alive), k=-1, dtype=bool)
+        crash &= alive[:, None]
+        crashes = crash.sum(axis=1) + crash.sum(axis=0) + hit_wall
+
+        s.dmg += COLLISION_DMG * crashes
+        s.pos = clamped
+
+    def _remove_dead_robots(self):
+        alive = self.state.dmg < MAX_DMG
+        if alive.all():
+            return
+        for r, is_alive in zip(self.robots, alive.tolist()):
+            if not is_alive:
+                self.workers.pop(r._board_id).close()
+                r._detach()
+        self.state.keep_robots(alive)
+        self.robots = [r for r, is_alive in zip(self.robots, alive) if is_alive]
+        self._assign_slots()
+
+    def _assign_slots(self):
+        for slot, r in enumerate(self.robots):
+            r._slot = slot
+
+    def close(self):
+        for w in self.workers.values():
+            w.close()
+        self.workers = {}
+
+    def frame(self) -> Frame:
+        s = self.state
+        robots = [
+            (r._board_id, x, y, dmg)
+            for r, (x, y), dmg in zip(self.robots, s.pos.tolist(), s.dmg.tolist())
+        ]
+        missiles = [
+            (k, sender, x, y, dist <= 0)
+            for k, sender, (x, y), dist in zip(
+                s.m_id.tolist(),
+                s.m_sender.tolist(),
+                s.m_pos.tolist(),
+                s.m_dist.tolist(),
+            )
+        ]
+        return robots, missiles
+
+    def to_round_schema(self) -> schemas.Round:
+        s = self.state
+        r_summary = {
+            r._board_id: schemas.RobotInRound(x=x, y=y, dmg=dmg)
+            for r, (x, y), dmg in zip(self.robots, s.pos.tolist(), s.dmg.tolist())
+        }
+        m_summary = {
+            k: schemas.MissileInRound(sender_id=sender, x=x, y=y, exploding=dist <= 0)
+            for k, sender, (x, y), dist in zip(
+                s.m_id.tolist(),
+                s.m_sender.tolist(),
+                s.m_pos.tolist(),
+                s.m_dist.tolist(),
+            )
+        }
+        return schemas.Round(robots=r_summary, missiles=m_summary)
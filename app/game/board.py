@@ -2,70 +2,162 @@ import math
 import random
 from typing import List, Tuple
 
-from func_timeout import func_timeout
-
 import app.schemas.simulation as schemas
 from app.game import *
+from app.game.explosions import explosion_damage
+from app.game.missiles import MISSILES_PER_ROBOT, MissilePool
+from app.game.recorder import Frame
+from app.game.rng import seed_worker
+from app.game.scanner import scan_robots
+from app.game.spatial import SpatialGrid
+from app.game.timing import skip_lap
+from app.game.worker import RobotWorker
 
 DISP_FACTOR = math.tau / 3
 
+# With fewer robots than these, checking every pair is faster than building
+# a `SpatialGrid` (see `benchmarks/spatial.py`)
+GRID_MIN_ROBOTS_CRASH = 64
+GRID_MIN_ROBOTS_EXPLOSION = 256
+
 
-def generate_init_positions(n: int) -> List[Tuple[float, float]]:
+def generate_init_positions(n: int, rng=random) -> List[Tuple[float, float]]:
     dirs = [
-        i * math.tau / n + random.uniform(-DISP_FACTOR / n, DISP_FACTOR / n)
+        i * math.tau / n + rng.uniform(-DISP_FACTOR / n, DISP_FACTOR / n)
         for i in range(n)
     ]
-    dirs = [(math.cos(d), math.sin(d), random.uniform(50, 475)) for d in dirs]
+    dirs = [(math.cos(d), math.sin(d), rng.uniform(50, 475)) for d in dirs]
     dirs = [(500 + x * d, 500 + y * d) for (x, y, d) in dirs]
-    random.shuffle(dirs)
+    rng.shuffle(dirs)
     return dirs
 
 
 class Board:
-    def __init__(self, robot_classes: List):
+    # Seeded boards play the same game every time: `seed` gives the initial
+    # positions and the random generator of every robot
+    def __init__(
+        self, robot_classes: List, worker_factory=RobotWorker, seed: int | None = None
+    ):
         self.robots = []
-        self.missiles = {}
-        self.cur_missile = 0
+        self.missiles = MissilePool(MISSILES_PER_ROBOT * len(robot_classes))
+        # Every robot runs its code in its own worker, indexed by board id
+        self.workers = {}
 
-        init_pos = generate_init_positions(len(robot_classes))
+        rng = random if seed is None else random.Random(seed)
+        init_pos = generate_init_positions(len(robot_classes), rng)
+        # Drawn only for seeded boards, others leave the shared generator alone
+        robot_seeds = None
+        if seed is not None:
+            robot_seeds = [rng.getrandbits(64) for _ in robot_classes]
         for i, (r_id, rc) in enumerate(robot_classes):
+            w = worker_factory()
             try:
+                if robot_seeds is not None:
+                    seed_worker(w, robot_seeds[i])
                 r = rc(r_id, i, init_pos[i])
-                func_timeout(INIT_TIMEOUT, r.initialize)
+                w.call(INIT_TIMEOUT, r.initialize)
                 self.robots.append(r)
+                self.workers[i] = w
             except:
-                pass
+                w.close()
 
-    def next_round(self):
-        for r in self.robots:
+    # Plays a round, calling `lap` with the name of every phase once it is
+    # played. Timed boards pass `PhaseTimes.lap`, see `enable_timing`.
+    def next_round(self, lap=skip_lap):
+        scanning = self._respond()
+        lap("respond")
+        # Positions do not change while robots respond, so every scan can be
+        # resolved at once
+        scan_robots(self.robots, scanning)
+        self._remove_dead_robots()
+        lap("scan")
+
+        self._advance_missiles()
+        lap("missiles")
+        self._explode_missiles()
+        lap("explosions")
+
+        self._move_robots()
+        self._remove_dead_robots()
+        lap("move")
+
+    # Returns the indexes of the robots that are scanning
+    def _respond(self) -> List[int]:
+        scanning = []
+        for i, r in enumerate(self.robots):
             # respond only schedules movement
             # neither scan nor attack depend on internal logic of others
             try:
-                func_timeout(RESPOND_TIMEOUT, r.respond)
-                r._scan(other._pos for other in self.robots if other is not r)
-                maybe_missile = r._launch_missile()
-                if maybe_missile is not None:
-                    self.missiles[self.cur_missile] = maybe_missile
-                    self.cur_missile += 1
+                self.workers[r._board_id].call(RESPOND_TIMEOUT, r.respond)
+                if r._scanner_params is not None:
+                    scanning.append(i)
+                r._launch_missile(self.missiles)
             except:
                 # Timeout or exception from respond call
                 # Either way, kill offending robot
                 r._dmg = MAX_DMG
-        # Clean up dead robots
-        self.robots = [r for r in self.robots if r._dmg < MAX_DMG]
+        return scanning
 
-        self.missiles = {k: m for k, m in self.missiles.items() if m._dist > 0}
+    def _advance_missiles(self):
+        self.missiles.remove_exploded()
         for m in self.missiles.values():
             m._advance()
 
-        for m in self.missiles.values():
-            m._explode(self.robots)
+    def _explode_missiles(self):
+        exploding = [m._pos for m in self.missiles.values() if m._dist <= 0]
+        if not exploding:
+            return
+        robot_pos = [r._pos for r in self.robots]
+        grid = None
+        if len(robot_pos) >= GRID_MIN_ROBOTS_EXPLOSION:
+            grid = SpatialGrid.from_positions(robot_pos)
+        dmg = explosion_damage(exploding, robot_pos, grid)
+        for r, d in zip(self.robots, dmg):
+            r._dmg += d
+
+    def _move_robots(self):
+        # Only check for collisions against `_move`d robots
+        if len(self.robots) < GRID_MIN_ROBOTS_CRASH:
+            for i in range(len(self.robots)):
+                self.robots[i]._move_and_check_crash(self.robots[:i])
+            return
 
-        for i in range(len(self.robots)):
-            # Only check for collisions against `_move`d robots
-            self.robots[i]._move_and_check_crash(self.robots[:i])
-        # Clean up dead robots
-        self.robots = [r for r in self.robots if r._dmg < MAX_DMG]
+        # Same as above, each robot joins the grid after its own move
+        grid = SpatialGrid()
+        for r in self.robots:
+            if r._move():
+                r._check_crash(grid.near(r._pos, ROBOT_DIAMETER))
+            grid.insert(r, r._pos)
+
+    def _remove_dead_robots(self):
+        for r in self.robots:
+            if r._dmg >= MAX_DMG:
+                break
+        else:
+            # Nobody died, keep the same list
+            return
+
+        alive = []
+        for r in self.robots:
+            if r._dmg < MAX_DMG:
+                alive.append(r)
+            else:
+                self.workers.pop(r._board_id).close()
+        self.robots = alive
+
+    def close(self):
+        for w in self.workers.values():
+            w.close()
+        self.workers = {}
+
+    # Plain rows of the robots and missiles, as taken by `Recorder.record`
+    def frame(self) -> Frame:
+        robots = [(r._board_id, r._pos[0], r._pos[1], r._dmg) for r in self.robots]
+        missiles = [
+            (k, m._sender, m._pos[0], m._pos[1], m._dist <= 0)
+            for k, m in self.missiles.items()
+        ]
+        return robots, missiles
 
     def to_round_schema(self) -> schemas.Round:
         r_summary = {
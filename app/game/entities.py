@@ -3,6 +3,7 @@ import math
 from typing import List, Tuple
 
 from app.game import *
+from app.game.explosions import explosion_damage
 
 
 def clamp(x, lo, hi):
@@ -21,7 +22,13 @@ def orientation(a, b, c):
 
 
 class Missile:
+    __slots__ = ("_sender", "_pos", "_dir", "_dist")
+
     def __init__(self, sender, src: Tuple[float, float], dir: float, dist: float):
+        self._reset(sender, src, dir, dist)
+
+    # Also used by `MissilePool` to reuse missiles that already exploded
+    def _reset(self, sender, src: Tuple[float, float], dir: float, dist: float):
         self._sender = sender
         self._pos = src
         self._dir = (math.cos(dir), math.sin(dir))
@@ -40,14 +47,9 @@ class Missile:
 
     def _explode(self, robots: List["Robot"]):
         if self._dist <= 0:
-            for r in robots:
-                d = math.dist(self._pos, r._pos)
-                if d < 5:
-                    r._dmg += NEAR_EXPLOSION_DMG
-                elif d < 20:
-                    r._dmg += MID_EXPLOSION_DMG
-                elif d < 40:
-                    r._dmg += FAR_EXPLOSION_DMG
+            dmg = explosion_damage([self._pos], [r._pos for r in robots])
+            for r, d in zip(robots, dmg):
+                r._dmg += d
 
 
 class Robot(abc.ABC):
@@ -66,9 +68,8 @@ class Robot(abc.ABC):
         self._cannon_params = None
         self._cannon_cooldown = 0
 
-    def _scan(self, scan_positions: List[Tuple[float, float]]):
-        if self._scanner_params is None:
-            return
+    # Consumes the pending scanner request
+    def _scan_edges(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
         dir, res = self._scanner_params
         # Reset scanner
         self._scanner_params = None
@@ -79,6 +80,12 @@ class Robot(abc.ABC):
         scan_l = (math.cos(scan_l), math.sin(scan_l))
         scan_r = (self._pos[0] + scan_r[0], self._pos[1] + scan_r[1])
         scan_l = (self._pos[0] + scan_l[0], self._pos[1] + scan_l[1])
+        return scan_l, scan_r
+
+    def _scan(self, scan_positions: List[Tuple[float, float]]):
+        if self._scanner_params is None:
+            return
+        scan_l, scan_r = self._scan_edges()
 
         # valid since the angle is always acute
         def in_scan_area(pt):
@@ -92,7 +99,7 @@ class Robot(abc.ABC):
             (math.dist(self._pos, pos) for pos in scan_positions), default=math.inf
         )
 
-    def _launch_missile(self) -> Missile | None:
+    def _launch_missile(self, pool: "MissilePool | None" = None) -> Missile | None:
         self._cannon_cooldown -= 1
         if self._cannon_cooldown > 0 or self._cannon_params is None:
             self._cannon_params = None
@@ -100,12 +107,19 @@ class Robot(abc.ABC):
         self._cannon_cooldown = CANNON_COOLDOWN
         dir, dist = self._cannon_params
         self._cannon_params = None
+        if pool is not None:
+            return pool.launch(self._board_id, self._pos, dir, dist)
         return Missile(self._board_id, self._pos, dir, dist)
 
     def _move_and_check_crash(self, others: List["Robot"]):
+        if self._move():
+            self._check_crash(others)
+
+    # Returns whether the robot moved, dead robots stay still
+    def _move(self) -> bool:
         # Robot is dead
         if self._dmg >= MAX_DMG:
-            return
+            return False
         # Update velocity
         self._current_vel = clamp(
             self._desired_vel,
@@ -117,6 +131,9 @@ class Robot(abc.ABC):
         delta_x = math.cos(self._dir) * delta_pos
         delta_y = math.sin(self._dir) * delta_pos
         self._pos = (self._pos[0] + delta_x, self._pos[1] + delta_y)
+        return True
+
+    def _check_crash(self, others: List["Robot"]):
         # Check against other robots and take collision damage
         for r in others:
             if math.dist(self._pos, r._pos) < ROBOT_DIAMETER:
@@ -149,7 +166,10 @@ class Robot(abc.ABC):
         return self._cannon_cooldown == 0
 
     def cannon(self, degree, distance):
-        self._cannon_params = (math.radians(degree % 360), clamp(distance, 0, 700))
+        self._cannon_params = (
+            math.radians(degree % 360),
+            clamp(distance, 0, MISSILE_MAX_DIST),
+        )
 
     def point_scanner(self, direction, resolution_in_degrees):
         self._scanner_params = (
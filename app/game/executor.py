@@ -1,50 +1,119 @@
-import importlib
-import inspect
-from typing import List
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
 
 from app.game import *
 from app.game.board import Board
+from app.game.host import host_context
+from app.game.loader import robot_loader
+from app.game.recorder import Frame, Recorder
+from app.game.stalemate import StalemateDetector
+from app.game.stopping import (
+    STOP_COMPLETED,
+    STOP_DECIDED,
+    STOP_SETTLED,
+    is_decided,
+    is_settled,
+    ranking,
+)
+from app.game.timing import PhaseTimes, enable_timing
+
+Counters = Tuple[int, Dict, Dict]
+
+# Executor of the games handed to a process of the pool, see `_init_worker`
+_worker_exec: "Executor | None" = None
+
+
+def _init_worker(robot_ids: List, board, timing: bool = False):
+    global _worker_exec
+    # Forked processes start with the random state of their parent, every
+    # process would play the same games without reseeding
+    random.seed()
+    np.random.seed()
+    _worker_exec = Executor(robot_ids, board, timing)
+
+
+def _run_games(games: int, rounds: int) -> Tuple[Counters, PhaseTimes | None]:
+    _worker_exec.reset_stats()
+    if _worker_exec.times is not None:
+        _worker_exec.times = PhaseTimes()
+    for _ in range(games):
+        _worker_exec.execute_game(rounds)
+    return _worker_exec.counters(), _worker_exec.times
 
 
 class Executor:
-    def __init__(self, robot_ids: List):
-        self.games_execd = 0
+    # With `timing`, the time of every phase of the games played is added up
+    # in `times`, see `app.game.timing`
+    def __init__(self, robot_ids: List, board=Board, timing: bool = False):
+        self.board = board
+        self.robot_ids = robot_ids
         self.robot_classes = []
-
-        self.won_games = {}
-        self.survived_games = {}
+        self.stop_reason = STOP_COMPLETED
+        self.times = PhaseTimes() if timing else None
+        # Hashes of the code of the robots, in the same order
+        self.code_hashes = []
 
         for r_id in robot_ids:
-            module = importlib.import_module(f".{r_id}", ROBOT_MODULE)
-            classes = inspect.getmembers(module, inspect.isclass)
-            classes = list(filter(lambda c: c[0] != "Robot", classes))
-            assert len(classes) == 1
-            robotName = classes[0][0]
-            r = getattr(module, robotName)
-            self.robot_classes.append((r_id, r))
-
-            self.won_games[r_id] = 0
-            self.survived_games[r_id] = 0
-
-    def simulate(self, rounds: int) -> List:
-        b = Board(self.robot_classes)
-        g = [b.to_round_schema()]
-        for _ in range(rounds):
-            b.next_round()
-            g.append(b.to_round_schema())
-            if len(b.robots) == 0 and len(b.missiles) == 0:
-                break
+            key, robot_class = robot_loader.load_hashed(r_id)
+            self.robot_classes.append((r_id, robot_class))
+            self.code_hashes.append(key)
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.games_execd = 0
+        self.won_games = {r_id: 0 for r_id in self.robot_ids}
+        self.survived_games = {r_id: 0 for r_id in self.robot_ids}
+
+    def counters(self) -> Counters:
+        return (self.games_execd, self.won_games, self.survived_games)
+
+    def merge_counters(self, counters: Counters):
+        games_execd, won_games, survived_games = counters
+        self.games_execd += games_execd
+        for r_id, won in won_games.items():
+            self.won_games[r_id] += won
+        for r_id, survived in survived_games.items():
+            self.survived_games[r_id] += survived
+
+    # Yields the frame of every round as soon as the board plays it,
+    # starting with the initial positions. Given a `seed`, the same robots
+    # always play the same game, unless they miss the deadline of a call.
+    def simulate_iter(self, rounds: int, seed: int | None = None) -> Iterator[Frame]:
+        b = self.board(self.robot_classes, seed=seed)
+        try:
+            yield b.frame()
+            for _ in range(rounds):
+                b.next_round()
+                yield b.frame()
+                if len(b.robots) == 0 and len(b.missiles) == 0:
+                    break
+        finally:
+            b.close()
+
+    def simulate(self, rounds: int, seed: int | None = None) -> Recorder:
+        g = Recorder(len(self.robot_classes), rounds)
+        for robots, missiles in self.simulate_iter(rounds, seed):
+            g.record(robots, missiles)
         return g
 
     def execute_game(self, rounds: int):
         self.games_execd += 1
-        b = Board(self.robot_classes)
+        if self.times is not None:
+            b = self._play_timed_game(rounds)
+        else:
+            b = self.board(self.robot_classes)
+            stalemate = StalemateDetector(self.robot_classes)
 
-        for _ in range(rounds):
-            b.next_round()
+            for _ in range(rounds):
+                b.next_round()
 
-            if len(b.robots) <= 1:
-                break
+                if len(b.robots) <= 1 or stalemate.update(b):
+                    break
+        b.close()
 
         survivors = list(map(lambda x: x._id, b.robots))
 
@@ -53,10 +122,94 @@ class Executor:
         if len(survivors) == 1:
             self.won_games[survivors[0]] += 1
 
+    # Same game as `execute_game`, adding the time of its phases to `times`
+    def _play_timed_game(self, rounds: int):
+        t = self.times
+        t.start()
+        b = self.board(self.robot_classes)
+        stalemate = StalemateDetector(self.robot_classes)
+        enable_timing(b, t)
+        t.lap("setup")
+
+        for _ in range(rounds):
+            # Laps its own phases, the last one ends here
+            b.next_round()
+
+            if len(b.robots) <= 1:
+                break
+            over = stalemate.update(b)
+            t.lap("stalemate")
+            if over:
+                break
+        return b
+
+    # Plays `games` games, split among `procs` processes. Every process loads
+    # the robots once and sends back its counters to be merged here. Given a
+    # `checkpoint`, it is called with the counters every `checkpoint_games`.
+    # Given a `stop_confidence`, games stop as soon as the ranking is decided
+    # or settled with that confidence, see `app.game.stopping`; the reason
+    # is left in `stop_reason`.
+    def execute_games(
+        self,
+        games: int,
+        rounds: int,
+        procs: int = MATCH_PROCS,
+        checkpoint: Callable[[Counters], None] | None = None,
+        checkpoint_games: int = CHECKPOINT_GAMES,
+        stop_confidence: float | None = None,
+    ):
+        self.stop_reason = STOP_COMPLETED
+        procs = min(procs, games)
+        if procs <= 1:
+            for played in range(1, games + 1):
+                self.execute_game(rounds)
+                if self._should_stop(games - played, stop_confidence):
+                    return
+                if checkpoint is not None and (
+                    played % checkpoint_games == 0 or played == games
+                ):
+                    checkpoint(self.counters())
+            return
+
+        # Games are handed to the pool in batches, stopping and checkpoints
+        # are only checked in between
+        batch = games
+        if checkpoint is not None or stop_confidence is not None:
+            batch = checkpoint_games
+        with ProcessPoolExecutor(
+            procs,
+            mp_context=host_context(),
+            initializer=_init_worker,
+            initargs=(self.robot_ids, self.board, self.times is not None),
+        ) as pool:
+            played = 0
+            while played < games:
+                b = min(batch, games - played)
+                p = min(procs, b)
+                slices = [b // p + (i < b % p) for i in range(p)]
+                for counters, times in pool.map(_run_games, slices, [rounds] * p):
+                    self.merge_counters(counters)
+                    if times is not None:
+                        self.times.merge(times)
+                played += b
+                if self._should_stop(games - played, stop_confidence):
+                    return
+                if checkpoint is not None:
+                    checkpoint(self.counters())
+
+    def _should_stop(self, remaining: int, confidence: float | None) -> bool:
+        if confidence is None or remaining == 0:
+            return False
+        if is_decided(self.won_games, remaining):
+            self.stop_reason = STOP_DECIDED
+        elif is_settled(self.won_games, self.games_execd, confidence):
+            self.stop_reason = STOP_SETTLED
+        else:
+            return False
+        return True
+
     def generate_stats(self):
-        positions = sorted(
-            self.won_games, key=lambda r: self.won_games[r], reverse=True
-        )
+        positions = ranking(self.won_games)
 
         # Offset all death counts by number of games played
         # We didn't know the offset before the games were executed
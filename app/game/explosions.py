@@ -0,0 +1,71 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.game import *
+from app.game.spatial import SpatialGrid
+
+EXPLOSION_RADII = (NEAR_EXPLOSION_RADIUS, MID_EXPLOSION_RADIUS, FAR_EXPLOSION_RADIUS)
+
+# Bands are nested, so a robot in the near band takes the damage of all
+# three terms: FAR + (MID - FAR) + (NEAR - MID) = NEAR
+EXPLOSION_BANDS = [
+    (FAR_EXPLOSION_RADIUS**2, FAR_EXPLOSION_DMG),
+    (MID_EXPLOSION_RADIUS**2, MID_EXPLOSION_DMG - FAR_EXPLOSION_DMG),
+    (NEAR_EXPLOSION_RADIUS**2, NEAR_EXPLOSION_DMG - MID_EXPLOSION_DMG),
+]
+
+# Below this many missile x robot pairs NumPy's call overhead costs more
+# than checking every pair in Python
+MIN_VECTORIZED_PAIRS = 128
+
+Positions = Sequence[Tuple[float, float]] | np.ndarray
+
+
+def _pairs_damage(
+    missile_pos: Positions, robot_pos: Positions, grid: SpatialGrid | None = None
+) -> List[int]:
+    near, mid, far = (r**2 for r in EXPLOSION_RADII)
+    dmg = [0] * len(robot_pos)
+    for mx, my in missile_pos:
+        if grid is None:
+            candidates = range(len(robot_pos))
+        else:
+            candidates = grid.near((mx, my), FAR_EXPLOSION_RADIUS)
+        for i in candidates:
+            rx, ry = robot_pos[i]
+            dx, dy = mx - rx, my - ry
+            d2 = dx * dx + dy * dy
+            if d2 < near:
+                dmg[i] += NEAR_EXPLOSION_DMG
+            elif d2 < mid:
+                dmg[i] += MID_EXPLOSION_DMG
+            elif d2 < far:
+                dmg[i] += FAR_EXPLOSION_DMG
+    return dmg
+
+
+def _matrix_damage(missile_pos: np.ndarray, robot_pos: np.ndarray) -> List[int]:
+    dx = missile_pos[:, 0, None] - robot_pos[None, :, 0]
+    dy = missile_pos[:, 1, None] - robot_pos[None, :, 1]
+    d2 = dx * dx + dy * dy
+
+    dmg = np.zeros(len(robot_pos), dtype=np.int64)
+    for r2, band_dmg in EXPLOSION_BANDS:
+        dmg += band_dmg * (d2 < r2).sum(axis=0)
+    return dmg.tolist()
+
+
+# Damage taken by each robot from all the missiles exploding in a round.
+# Distances are compared squared against the damage bands. Given a
+# `SpatialGrid` of the robot indices, each missile only looks at the robots
+# around it; otherwise, with enough missiles and robots, the whole
+# missile x robot matrix is built at once.
+def explosion_damage(
+    missile_pos: Positions, robot_pos: Positions, grid: SpatialGrid | None = None
+) -> List[int]:
+    if grid is not None or len(missile_pos) * len(robot_pos) < MIN_VECTORIZED_PAIRS:
+        return _pairs_damage(missile_pos, robot_pos, grid)
+    return _matrix_damage(
+        np.asarray(missile_pos, dtype=float), np.asarray(robot_pos, dtype=float)
+    )
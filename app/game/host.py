@@ -0,0 +1,30 @@
+import multiprocessing
+import multiprocessing.forkserver
+from multiprocessing.context import BaseContext
+
+from app.game import *
+
+# Imported once by the fork server, every process it forks for a match starts
+# with them loaded. Besides the game engine, the heavy modules robots may
+# import (see `app.util.check_code`); the ones not installed are skipped.
+HOST_PRELOAD = ["app.game.executor", "numpy", "tensorflow"]
+
+
+# Context of the process pools that play the games of matches. With the
+# "forkserver" method a single server process imports `HOST_PRELOAD` and
+# forks the pool processes of every match from then on, so robots importing
+# numpy or tensorflow never wait for the import. It is started by the first
+# pool, or by `warm_up`. Unlike "fork", pools never copy the server process
+# with its request and scheduler threads half way through their work.
+def host_context(method: str = POOL_START_METHOD) -> BaseContext:
+    ctx = multiprocessing.get_context(method)
+    if method == "forkserver":
+        ctx.set_forkserver_preload(HOST_PRELOAD)
+    return ctx
+
+
+# Starts the fork server before any match needs it
+def warm_up(method: str = POOL_START_METHOD):
+    if method == "forkserver":
+        host_context(method)
+        multiprocessing.forkserver.ensure_running()
@@ -0,0 +1,188 @@
+import ast
+import hashlib
+import importlib.util
+import inspect
+import marshal
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+from typing import Tuple
+
+from app.game import *
+from app.game.rng import robot_builtins
+from app.util.assets import ASSETS_DIR
+
+# Line that uploaded code gets in front, users write robots without it
+ROBOT_HEADER = b"from app.game.entities import Robot\n"
+
+# Compiled code is stored next to the source as the interpreter magic number,
+# the hash of the source it was compiled from and the marshalled code object.
+# The file name has the cache tag of the interpreter, like `__pycache__` does.
+COMPILED_MAGIC = importlib.util.MAGIC_NUMBER
+COMPILED_HASH_SZ = hashlib.sha256().digest_size
+
+
+def robot_code_path(r_id) -> str:
+    return f"{ASSETS_DIR}/robots/code/{r_id}.py"
+
+
+def robot_compiled_path(r_id) -> str:
+    return f"{ASSETS_DIR}/robots/code/{r_id}.{sys.implementation.cache_tag}.code"
+
+
+def code_hash(src: bytes) -> str:
+    return hashlib.sha256(src).hexdigest()
+
+
+# Compiles an uploaded robot from the tree `check_code` already parsed. Lines
+# are moved down by the header so tracebacks match the stored source.
+def compile_robot(tree: ast.Module, path: str) -> types.CodeType:
+    header = ast.parse(ROBOT_HEADER)
+    ast.increment_lineno(tree, 1)
+    tree.body[:0] = header.body
+    return compile(tree, path, "exec")
+
+
+def _write_compiled(r_id, key: str, code: types.CodeType):
+    path = robot_compiled_path(r_id)
+    # Written aside and moved, so processes loading the robot never read half
+    # of the file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(COMPILED_MAGIC)
+        f.write(bytes.fromhex(key))
+        f.write(marshal.dumps(code))
+    os.replace(tmp, path)
+
+
+# The stored code of a robot, if it was compiled from the source with hash
+# `key` by this same interpreter
+def _read_compiled(r_id, key: str) -> types.CodeType | None:
+    try:
+        with open(robot_compiled_path(r_id), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    magic_sz = len(COMPILED_MAGIC)
+    if data[:magic_sz] != COMPILED_MAGIC:
+        return None
+    if data[magic_sz : magic_sz + COMPILED_HASH_SZ] != bytes.fromhex(key):
+        return None
+    try:
+        return marshal.loads(data[magic_sz + COMPILED_HASH_SZ :])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+# Compiles the code of a robot, caching it next to the source
+def _compile_file(r_id, key: str, src: bytes, path: str) -> types.CodeType:
+    code = _read_compiled(r_id, key)
+    if code is None:
+        code = compile(src, path, "exec")
+        try:
+            _write_compiled(r_id, key, code)
+        except OSError:
+            # Only makes the next load slower
+            pass
+    return code
+
+
+# Runs the code of a robot in a module of its own, which is never added to
+# `sys.modules`, and returns the robot class defined there
+def _exec_robot(code: types.CodeType, r_id, path: str):
+    module = types.ModuleType(f"{ROBOT_MODULE}.{r_id}")
+    module.__file__ = path
+    # Robots importing `random` get `app.game.rng.robot_random`
+    module.__builtins__ = robot_builtins()
+    exec(code, module.__dict__)
+    classes = inspect.getmembers(module, inspect.isclass)
+    classes = list(filter(lambda c: c[0] != "Robot", classes))
+    assert len(classes) == 1
+    return classes[0][1]
+
+
+# Compiles the code of robots once per content and runs it once per robot,
+# keeping the latest `size` compiled contents and the latest `size` loaded
+# robots. Robots with the same code get a module each, they can keep state in
+# their module globals. A robot is looked up by the hash of its file, so code
+# written after a robot was loaded is never mistaken for the cached one;
+# `forget` only frees the code about to be replaced. Code missing here is
+# read from the compiled file stored with the robot, and only compiled when
+# that one is missing or stale.
+class RobotLoader:
+    def __init__(self, size: int = ROBOT_CACHE_SIZE):
+        self.size = size
+        # Hash -> code
+        self._codes: OrderedDict[str, types.CodeType] = OrderedDict()
+        # (hash, robot id) -> class
+        self._classes: OrderedDict[Tuple[str, object], type] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Number of robots loaded
+    def __len__(self):
+        return len(self._classes)
+
+    # Whether the code with hash `key` is compiled
+    def __contains__(self, key: str):
+        return key in self._codes
+
+    def load(self, r_id):
+        return self.load_hashed(r_id)[1]
+
+    # Same as `load`, also returning the hash of the code that was loaded
+    def load_hashed(self, r_id) -> Tuple[str, type]:
+        path = robot_code_path(r_id)
+        with open(path, "rb") as f:
+            src = f.read()
+        key = code_hash(src)
+
+        with self._lock:
+            robot_class = self._classes.get((key, r_id))
+            if robot_class is not None:
+                self._classes.move_to_end((key, r_id))
+                self._codes.move_to_end(key)
+                return key, robot_class
+            code = self._codes.get(key)
+
+        if code is None:
+            code = _compile_file(r_id, key, src, path)
+        robot_class = _exec_robot(code, r_id, path)
+
+        with self._lock:
+            self._codes[key] = code
+            self._codes.move_to_end(key)
+            robot_class = self._classes.setdefault((key, r_id), robot_class)
+            self._classes.move_to_end((key, r_id))
+            while len(self._codes) > self.size:
+                self._codes.popitem(last=False)
+            while len(self._classes) > self.size:
+                self._classes.popitem(last=False)
+        return key, robot_class
+
+    # Drops the cached code of a robot, called before its file is replaced
+    def forget(self, r_id):
+        path = robot_code_path(r_id)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            key = code_hash(f.read())
+        with self._lock:
+            self._codes.pop(key, None)
+            for k in [k for k in self._classes if k[0] == key]:
+                del self._classes[k]
+
+    # Stores the code of a robot, already checked and parsed into `tree` by
+    # `check_code`, along with its compiled code
+    def save(self, r_id, src: bytes, tree: ast.Module):
+        self.forget(r_id)
+        path = robot_code_path(r_id)
+        code = compile_robot(tree, path)
+        src = ROBOT_HEADER + src
+        with open(path, "wb") as f:
+            f.write(src)
+        _write_compiled(r_id, code_hash(src), code)
+
+
+robot_loader = RobotLoader()
@@ -0,0 +1,49 @@
+import math
+from typing import Dict, List, Tuple
+
+from app.game import *
+from app.game.entities import Missile
+
+# A missile flies at most this many rounds, including the one it explodes in
+MISSILE_ROUNDS = math.ceil(MISSILE_MAX_DIST / MISSILE_D_DELTA) + 2
+MISSILES_PER_ROBOT = math.ceil(MISSILE_ROUNDS / CANNON_COOLDOWN)
+
+
+# Live missiles of a board, keyed by a stable id. Exploded missiles go back
+# to a free list and are reused by later launches instead of allocating new
+# ones; the pool only grows past its initial capacity if robots somehow
+# manage to keep more missiles in the air.
+class MissilePool:
+    __slots__ = ("_live", "_free", "next_id")
+
+    def __init__(self, capacity: int):
+        self._live: Dict[int, Missile] = {}
+        self._free: List[Missile] = [Missile.__new__(Missile) for _ in range(capacity)]
+        self.next_id = 0
+
+    def launch(self, sender, src: Tuple[float, float], dir: float, dist: float):
+        m = self._free.pop() if self._free else Missile.__new__(Missile)
+        m._reset(sender, src, dir, dist)
+        self._live[self.next_id] = m
+        self.next_id += 1
+        return m
+
+    def remove_exploded(self):
+        exploded = [k for k, m in self._live.items() if m._dist <= 0]
+        for k in exploded:
+            self._free.append(self._live.pop(k))
+
+    def __setitem__(self, k: int, m: Missile):
+        self._live[k] = m
+
+    def __getitem__(self, k: int) -> Missile:
+        return self._live[k]
+
+    def __len__(self):
+        return len(self._live)
+
+    def items(self):
+        return self._live.items()
+
+    def values(self):
+        return self._live.values()
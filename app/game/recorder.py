@@ -0,0 +1,105 @@
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+# Same fields as `schemas.RobotInRound` and `schemas.MissileInRound`, plus
+# the keys they have in their round. Coordinates are truncated to ints when
+# written, just like pydantic does with the `int` fields of the schemas.
+ROBOT_FRAME = np.dtype(
+    [("board_id", np.int32), ("x", np.int32), ("y", np.int32), ("dmg", np.int32)]
+)
+MISSILE_FRAME = np.dtype(
+    [
+        ("id", np.int64),
+        ("sender_id", np.int32),
+        ("x", np.int32),
+        ("y", np.int32),
+        ("exploding", np.bool_),
+    ]
+)
+
+RobotRow = Tuple[int, float, float, int]
+MissileRow = Tuple[int, int, float, float, bool]
+Frame = Tuple[List[RobotRow], List[MissileRow]]
+
+
+# One round in the JSON shape of `schemas.Round`
+def round_json(robots: List[RobotRow], missiles: List[MissileRow]) -> str:
+    r_json = ",".join(
+        f'"{k}":{{"x":{int(x)},"y":{int(y)},"dmg":{int(dmg)}}}'
+        for k, x, y, dmg in robots
+    )
+    m_json = ",".join(
+        f'"{k}":{{"sender_id":{sender},"x":{int(x)},"y":{int(y)},'
+        f'"exploding":{"true" if exploding else "false"}}}'
+        for k, sender, x, y, exploding in missiles
+    )
+    return f'{{"robots":{{{r_json}}},"missiles":{{{m_json}}}}}'
+
+
+# Records every round of a simulation into preallocated structured arrays.
+# Round `i` owns the rows `offsets[i]:offsets[i + 1]` of each frame array.
+# Robot frames never outgrow `(rounds + 1) * robots` rows; missile frames
+# start with the same size and double whenever they run out of rows.
+class Recorder:
+    def __init__(self, robots: int, rounds: int):
+        capacity = max(1, (rounds + 1) * robots)
+        self.robot_frames = np.zeros(capacity, dtype=ROBOT_FRAME)
+        self.missile_frames = np.zeros(capacity, dtype=MISSILE_FRAME)
+        self.robot_offsets = np.zeros(rounds + 2, dtype=np.int64)
+        self.missile_offsets = np.zeros(rounds + 2, dtype=np.int64)
+        self.rounds = 0
+        # Rounds already serialized by `to_json`
+        self._rounds_json = None
+
+    def __len__(self):
+        return self.rounds
+
+    # Takes the rows returned by the `frame` method of the boards
+    def record(self, robots: List[RobotRow], missiles: List[MissileRow]):
+        r_start = self.robot_offsets[self.rounds]
+        m_start = self.missile_offsets[self.rounds]
+        r_end = r_start + len(robots)
+        m_end = m_start + len(missiles)
+
+        if m_end > len(self.missile_frames):
+            grown = np.zeros(
+                max(m_end, 2 * len(self.missile_frames)), dtype=MISSILE_FRAME
+            )
+            grown[:m_start] = self.missile_frames[:m_start]
+            self.missile_frames = grown
+
+        if robots:
+            self.robot_frames[r_start:r_end] = robots
+        if missiles:
+            self.missile_frames[m_start:m_end] = missiles
+        self.rounds += 1
+        self._rounds_json = None
+        self.robot_offsets[self.rounds] = r_end
+        self.missile_offsets[self.rounds] = m_end
+
+    # Rounds serialized one by one, in the JSON shape of `schemas.Round`
+    def iter_rounds_json(self) -> Iterator[str]:
+        robots = self.robot_frames[: self.robot_offsets[self.rounds]].tolist()
+        missiles = self.missile_frames[: self.missile_offsets[self.rounds]].tolist()
+        r_offsets = self.robot_offsets.tolist()
+        m_offsets = self.missile_offsets.tolist()
+
+        for i in range(self.rounds):
+            yield round_json(
+                robots[r_offsets[i] : r_offsets[i + 1]],
+                missiles[m_offsets[i] : m_offsets[i + 1]],
+            )
+
+    # Whole simulation in the JSON shape of `schemas.SimulationResponse`,
+    # `robots` must already be JSON serializable. Rounds are serialized once,
+    # recordings kept around answer again with the same string.
+    def to_json(self, robots: Dict[Any, Any], seed: int | None = None) -> str:
+        if self._rounds_json is None:
+            self._rounds_json = ",".join(self.iter_rounds_json())
+        seed_json = "" if seed is None else f',"seed":{seed}'
+        return (
+            f'{{"robots":{json.dumps(robots)}{seed_json},'
+            f'"rounds":[{self._rounds_json}]}}'
+        )
@@ -0,0 +1,168 @@
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+from app.game.recorder import Recorder
+
+# Compact encoding of a recorded simulation, decoded by the client back into
+# the exact `SimulationResponse` JSON. Positions are the same truncated ints
+# of `RobotInRound` and `MissileInRound`.
+#
+#   keyframes: every `keyframe_interval` rounds, `[board_id, x, y, dmg]` of
+#              every robot in that round
+#   deltas:    one string per round (empty for keyframes) with the change of
+#              x, y and dmg of every robot still in the round, in keyframe
+#              order, written as varints
+#   deaths:    `[round, board_id]` for the first round a robot is missing
+#   missiles:  `[id, sender_id, round, x, y, path, exploded]` per missile,
+#              where it first appears and its moves in the following rounds
+#              as varint x, y pairs. A missile that exploded does so in its
+#              last round.
+REPLAY_VERSION = 1
+KEYFRAME_INTERVAL = 100
+
+# Varints are zigzag encoded in base 32: characters in the upper half of the
+# alphabet carry 5 bits and continue the number, the lower half ends it. Most
+# deltas end up in a single character.
+VARINT_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+VARINT_VALUES = {c: i for i, c in enumerate(VARINT_ALPHABET)}
+
+
+def encode_varints(values: List[int]) -> str:
+    out = []
+    for v in values:
+        z = 2 * v if v >= 0 else -2 * v - 1
+        while z >= 32:
+            out.append(VARINT_ALPHABET[32 + (z & 31)])
+            z >>= 5
+        out.append(VARINT_ALPHABET[z])
+    return "".join(out)
+
+
+def decode_varints(s: str) -> Iterator[int]:
+    z, shift = 0, 0
+    for c in s:
+        d = VARINT_VALUES[c]
+        if d >= 32:
+            z |= (d - 32) << shift
+            shift += 5
+            continue
+        z |= d << shift
+        yield z >> 1 if z % 2 == 0 else -(z >> 1) - 1
+        z, shift = 0, 0
+
+
+def _frame_rounds(offsets: np.ndarray, rounds: int) -> np.ndarray:
+    # Round of every row of a frame array
+    return np.repeat(np.arange(rounds), np.diff(offsets[: rounds + 1]))
+
+
+def encode_replay(
+    recording: Recorder,
+    robots: Dict[Any, Any],
+    keyframe_interval: int = KEYFRAME_INTERVAL,
+) -> Dict:
+    r_offsets = recording.robot_offsets.tolist()
+    r_frames = recording.robot_frames[: r_offsets[recording.rounds]].tolist()
+
+    keyframes, deltas, deaths = [], [], []
+    prev = {}
+    for i in range(recording.rounds):
+        cur = {
+            k: (x, y, dmg) for k, x, y, dmg in r_frames[r_offsets[i] : r_offsets[i + 1]]
+        }
+        deaths.extend([i, k] for k in prev if k not in cur)
+        if i % keyframe_interval == 0:
+            keyframes.append([[k, x, y, dmg] for k, (x, y, dmg) in cur.items()])
+            deltas.append("")
+        else:
+            values = []
+            for k, (x, y, dmg) in cur.items():
+                px, py, pdmg = prev[k]
+                values += [x - px, y - py, dmg - pdmg]
+            deltas.append(encode_varints(values))
+        prev = cur
+
+    m_count = recording.missile_offsets[recording.rounds]
+    m_frames = recording.missile_frames[:m_count]
+    m_rounds = _frame_rounds(recording.missile_offsets, recording.rounds)
+    # Every missile shows up in consecutive rounds, group its rows in order
+    order = np.argsort(m_frames["id"], kind="stable")
+    m_frames, m_rounds = m_frames[order].tolist(), m_rounds[order].tolist()
+
+    missiles = []
+    start = 0
+    while start < len(m_frames):
+        end = start
+        while end < len(m_frames) and m_frames[end][0] == m_frames[start][0]:
+            end += 1
+        k, sender, x, y, _ = m_frames[start]
+        path = []
+        for (_, _, x0, y0, _), (_, _, x1, y1, _) in zip(
+            m_frames[start : end - 1], m_frames[start + 1 : end]
+        ):
+            path += [x1 - x0, y1 - y0]
+        exploded = m_frames[end - 1][4]
+        missiles.append(
+            [k, sender, m_rounds[start], x, y, encode_varints(path), exploded]
+        )
+        start = end
+
+    return {
+        "robots": robots,
+        "version": REPLAY_VERSION,
+        "rounds": recording.rounds,
+        "keyframe_interval": keyframe_interval,
+        "keyframes": keyframes,
+        "deltas": deltas,
+        "deaths": deaths,
+        "missiles": missiles,
+    }
+
+
+# Rebuilds the `SimulationResponse` JSON from an encoded replay
+def decode_replay(replay: Dict) -> Dict:
+    interval = replay["keyframe_interval"]
+    deaths = {}
+    for i, k in replay["deaths"]:
+        deaths.setdefault(i, set()).add(k)
+
+    rounds = []
+    cur = {}
+    for i in range(replay["rounds"]):
+        if i % interval == 0:
+            cur = {
+                k: [x, y, dmg] for k, x, y, dmg in replay["keyframes"][i // interval]
+            }
+        else:
+            for k in deaths.get(i, ()):
+                del cur[k]
+            d = decode_varints(replay["deltas"][i])
+            for row in cur.values():
+                for j in range(3):
+                    row[j] += next(d)
+        rounds.append(
+            {
+                "robots": {
+                    str(k): {"x": x, "y": y, "dmg": dmg}
+                    for k, (x, y, dmg) in cur.items()
+                },
+                "missiles": {},
+            }
+        )
+
+    for k, sender, first, x, y, path, exploded in replay["missiles"]:
+        moves = list(decode_varints(path))
+        last = first + len(moves) // 2
+        for i in range(first, last + 1):
+            if i > first:
+                x += moves[2 * (i - first - 1)]
+                y += moves[2 * (i - first - 1) + 1]
+            rounds[i]["missiles"][str(k)] = {
+                "sender_id": sender,
+                "x": x,
+                "y": y,
+                "exploding": exploded and i == last,
+            }
+
+    return {"robots": replay["robots"], "rounds": rounds}
@@ -0,0 +1,62 @@
+import builtins
+import functools
+import random
+import threading
+import types
+from typing import Dict
+
+from app.game import *
+
+# Random generator of the robot running in the current thread. Every robot
+# runs in a worker thread of its own (see `app.game.worker`), seeded boards
+# give each one a generator with its own seed.
+_local = threading.local()
+
+
+def use(rng: random.Random):
+    _local.rng = rng
+
+
+# Gives the robot of `worker` its own generator
+def seed_worker(worker, seed: int):
+    worker.call(INIT_TIMEOUT, functools.partial(use, random.Random(seed)))
+
+
+def _dispatch(name: str):
+    fallback = getattr(random, name)
+
+    @functools.wraps(fallback)
+    def call(*args, **kwargs):
+        rng = getattr(_local, "rng", None)
+        if rng is None:
+            return fallback(*args, **kwargs)
+        return getattr(rng, name)(*args, **kwargs)
+
+    # Builtin methods have no module, `app.game.stalemate` looks for it
+    call.__module__ = "random"
+    return call
+
+
+# Stands in for the `random` module imported by robots. Its functions use the
+# generator of the robot calling them, or the shared one of `random` in
+# threads that were not given one, so robots without a seed behave as always.
+robot_random = types.ModuleType("random", random.__doc__)
+for _name, _value in vars(random).items():
+    if _name.startswith("__"):
+        continue
+    # The functions of `random` are methods of its hidden `Random` instance
+    if getattr(_value, "__self__", None) is getattr(random.random, "__self__"):
+        _value = _dispatch(_name)
+    setattr(robot_random, _name, _value)
+
+
+def _robot_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if name == "random" and level == 0:
+        return robot_random
+    return builtins.__import__(name, globals, locals, fromlist, level)
+
+
+# Builtins of the modules of robots, importing `random` gives them
+# `robot_random`
+def robot_builtins() -> Dict:
+    return {**vars(builtins), "__import__": _robot_import}
@@ -0,0 +1,52 @@
+import math
+from typing import List
+
+import numpy as np
+
+from app.game.entities import Robot
+
+# Below this many scanner x robot pairs NumPy's call overhead costs more
+# than running each robot's own `_scan`
+MIN_VECTORIZED_SCAN_PAIRS = 64
+
+
+# Resolves the pending `point_scanner` request of the robots at the indices
+# `scanning`, each one against every other robot in `robots`.
+# The scan zone test is the same pair of `orientation` cross products that
+# `Robot._scan` uses, evaluated for all the scanners x robots pairs at once.
+# A spatial index is of no help here since scans have unlimited range.
+def scan_robots(robots: List[Robot], scanning: List[int]):
+    if len(scanning) * len(robots) < MIN_VECTORIZED_SCAN_PAIRS:
+        for i in scanning:
+            r = robots[i]
+            r._scan(other._pos for other in robots if other is not r)
+        return
+
+    positions = [r._pos for r in robots]
+    pos = np.array(positions, dtype=float)
+    idx = np.array(scanning)
+    edges = np.array([robots[i]._scan_edges() for i in scanning], dtype=float)
+
+    # Broadcast to a (scanners, robots) matrix for each coordinate
+    ax, ay = pos[idx, 0, None], pos[idx, 1, None]
+    lx, ly = edges[:, 0, 0, None], edges[:, 0, 1, None]
+    rx, ry = edges[:, 1, 0, None], edges[:, 1, 1, None]
+    cx, cy = pos[None, :, 0], pos[None, :, 1]
+
+    # orientation(a, scan_l, c) >= 0 and orientation(a, scan_r, c) <= 0
+    right_of_left = (ax - lx) * (cy - ly) - (ay - ly) * (cx - lx) >= 0
+    left_of_right = (ax - rx) * (cy - ry) - (ay - ry) * (cx - rx) <= 0
+    in_scan_area = right_of_left & left_of_right
+    # Robots never scan themselves
+    in_scan_area[np.arange(len(idx)), idx] = False
+
+    dx, dy = cx - ax, cy - ay
+    d2 = np.where(in_scan_area, dx * dx + dy * dy, np.inf)
+    nearest = d2.argmin(axis=1)
+
+    for s, (i, j) in enumerate(zip(scanning, nearest.tolist())):
+        if in_scan_area[s, j]:
+            result = math.dist(positions[i], positions[j])
+        else:
+            result = math.inf
+        robots[i]._scanner_result = result
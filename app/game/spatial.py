@@ -0,0 +1,44 @@
+from typing import Dict, Iterable, List, Tuple
+
+from app.game import *
+
+
+# Uniform grid over the board that buckets items by the cell of their
+# position. Lookups only visit the cells overlapping the searched square, so
+# they return a superset of the items within `radius` that the caller still
+# has to filter by distance.
+class SpatialGrid:
+    __slots__ = ("cell_size", "cells")
+
+    def __init__(self, cell_size: float = GRID_CELL_SZ):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List] = {}
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[Tuple[float, float]], **kwargs):
+        grid = cls(**kwargs)
+        for i, pos in enumerate(positions):
+            grid.insert(i, pos)
+        return grid
+
+    def insert(self, item, pos: Tuple[float, float]):
+        key = (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = [item]
+        else:
+            cell.append(item)
+
+    def near(self, pos: Tuple[float, float], radius: float) -> List:
+        x0 = int((pos[0] - radius) // self.cell_size)
+        x1 = int((pos[0] + radius) // self.cell_size)
+        y0 = int((pos[1] - radius) // self.cell_size)
+        y1 = int((pos[1] + radius) // self.cell_size)
+
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is not None:
+                    found.extend(cell)
+        return found
@@ -0,0 +1,177 @@
+import inspect
+from typing import Dict, List, Tuple
+
+from app.game import *
+from app.game.array_board import ROBOT_VIEW_VARS
+from app.game.entities import Robot
+
+# Imports allowed to robots (see `app.util.check_code`) that may give
+# different results for the same state, games of robots using them never end
+# in a stalemate
+NONDETERMINISTIC_MODULES = {"random", "numpy", "tensorflow"}
+# Values that can be told apart only by comparing them
+PLAIN_TYPES = {int, float, complex, bool, str, bytes, type(None)}
+
+
+class _Probe(Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        return
+
+
+# Attributes that boards keep in robots, everything else belongs to the robot
+ENGINE_VARS = set(vars(_Probe(0, 0, (0, 0)))) | ROBOT_VIEW_VARS
+
+
+def _is_plain(v) -> bool:
+    if type(v) in PLAIN_TYPES:
+        return True
+    if type(v) in (tuple, frozenset):
+        return all(_is_plain(x) for x in v)
+    return False
+
+
+def _plain_items(items) -> Tuple | None:
+    items = tuple(items)
+    return items if all(_is_plain(v) for _, v in items) else None
+
+
+def _module_of(v) -> str:
+    if inspect.ismodule(v):
+        return v.__name__
+    name = getattr(v, "__module__", None)
+    if name is None and hasattr(v, "__self__"):
+        # Methods of builtin objects, like `random.random`
+        name = type(v.__self__).__module__
+    return name if isinstance(name, str) else ""
+
+
+# Globals of the module a robot class was defined in. Robot modules are not
+# kept in `sys.modules`, see `app.game.loader`.
+def _module_globals(robot_class) -> Dict:
+    return robot_class.respond.__globals__
+
+
+def is_deterministic(robot_class) -> bool:
+    return all(
+        _module_of(v).split(".")[0] not in NONDETERMINISTIC_MODULES
+        for v in _module_globals(robot_class).values()
+    )
+
+
+# Values a function keeps between calls: its default arguments and the
+# variables it closes over. Methods calling `super()` close over their class,
+# which is not state of its own.
+def _function_state(f) -> Tuple:
+    values = [*(f.__defaults__ or ()), *(f.__kwdefaults__ or {}).values()]
+    for name, cell in zip(f.__code__.co_freevars, f.__closure__ or ()):
+        if name == "__class__":
+            continue
+        try:
+            values.append(cell.cell_contents)
+        except ValueError:
+            # Not assigned yet
+            values.append(None)
+    return tuple(values)
+
+
+def _functions(v) -> List:
+    if isinstance(v, (staticmethod, classmethod)):
+        v = v.__func__
+    if isinstance(v, property):
+        return [f for f in (v.fget, v.fset, v.fdel) if f is not None]
+    return [v] if inspect.isfunction(v) else []
+
+
+# Data kept by a robot class, the classes it inherits from in its module and
+# the module itself, robots can keep state there too. Functions, classes and
+# modules are left out, but not what their functions keep between calls.
+def _static_state(robot_class) -> Tuple | None:
+    module_globals = _module_globals(robot_class)
+    classes = [c for c in robot_class.__mro__ if c.__module__ == robot_class.__module__]
+    items = [*(i for c in classes for i in vars(c).items()), *module_globals.items()]
+
+    def data(items):
+        return (
+            (k, v)
+            for k, v in items
+            if not k.startswith("__")
+            and k != "_abc_impl"
+            and not callable(v)
+            and not inspect.ismodule(v)
+            and not isinstance(v, (staticmethod, classmethod, property))
+        )
+
+    functions = (
+        (f.__qualname__, _function_state(f))
+        for _, v in items
+        for f in _functions(v)
+        # Functions imported from other modules keep state of their own
+        # modules, not of the robot
+        if f.__globals__ is module_globals
+    )
+    return _plain_items([*data(items), *functions])
+
+
+def _robot_state(r) -> Tuple | None:
+    user_vars = _plain_items((k, v) for k, v in vars(r).items() if k not in ENGINE_VARS)
+    if user_vars is None:
+        return None
+    return (
+        r._board_id,
+        r._pos,
+        r._dir,
+        r._current_vel,
+        r._desired_vel,
+        r._dmg,
+        # Past zero the cooldown keeps going down, but every negative value
+        # behaves the same
+        max(r._cannon_cooldown, -1),
+        r._scanner_result,
+        user_vars,
+    )
+
+
+# Ends a game once every robot on the board stayed exactly the same for
+# `window` rounds with no missiles flying. Robots only change their state in
+# `respond`, which can only look at that same state, so from then on every
+# round would be the same. State that can't be compared by value, like lists
+# or objects in robot attributes or in default arguments, and robots using
+# random numbers keep the game going.
+class StalemateDetector:
+    def __init__(self, robot_classes: List, window: int = STALEMATE_ROUNDS):
+        self.window = window
+        self.enabled = window > 0 and all(
+            is_deterministic(rc) for _, rc in robot_classes
+        )
+        self._classes = list({rc for _, rc in robot_classes})
+        self._last = None
+        self._still = 0
+
+    def _fingerprint(self, board) -> Tuple | None:
+        if len(board.missiles) > 0:
+            return None
+        robots = []
+        for r in board.robots:
+            state = _robot_state(r)
+            if state is None:
+                return None
+            robots.append(state)
+        static = [_static_state(rc) for rc in self._classes]
+        if any(s is None for s in static):
+            return None
+        return (tuple(robots), tuple(static))
+
+    # Called after every round, returns whether the game is a stalemate
+    def update(self, board) -> bool:
+        if not self.enabled:
+            return False
+        fingerprint = self._fingerprint(board)
+        if fingerprint is None or fingerprint != self._last:
+            self._last = fingerprint
+            self._still = 0
+            return False
+        self._still += 1
+        return self._still >= self.window
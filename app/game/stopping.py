@@ -0,0 +1,52 @@
+import math
+from typing import Dict, List
+
+# Why `Executor.execute_games` stopped playing games
+STOP_COMPLETED = "completed"
+STOP_DECIDED = "decided"
+STOP_SETTLED = "settled"
+
+# With fewer games a ranking is never considered statistically settled
+MIN_SETTLED_GAMES = 10
+
+
+# Same order as `Executor.generate_stats`: by won games, ties keep the order
+# of the robots
+def ranking(won_games: Dict) -> List:
+    return sorted(won_games, key=lambda r: won_games[r], reverse=True)
+
+
+# Whether no outcome of the `remaining` games can change the ranking. The
+# ranking holds if no robot can pass the one right above it even by winning
+# every remaining game; robots further down need even more wins.
+def is_decided(won_games: Dict, remaining: int) -> bool:
+    order = {r: i for i, r in enumerate(won_games)}
+    rank = ranking(won_games)
+    for above, below in zip(rank, rank[1:]):
+        best = won_games[below] + remaining
+        if best > won_games[above]:
+            return False
+        if best == won_games[above] and order[below] < order[above]:
+            return False
+    return True
+
+
+# P(X >= k) for X ~ Binomial(n, 1/2)
+def _binomial_tail(k: int, n: int) -> float:
+    return sum(math.comb(n, i) for i in range(k, n + 1)) / 2**n
+
+
+# Whether every robot wins more often than the one below it in the ranking,
+# with the given confidence. Each pair is tested on the games either of them
+# won, which split evenly if both robots were as strong; the confidence is
+# shared among the pairs (Bonferroni).
+def is_settled(won_games: Dict, games_played: int, confidence: float) -> bool:
+    if games_played < MIN_SETTLED_GAMES:
+        return False
+    rank = ranking(won_games)
+    alpha = (1 - confidence) / max(len(rank) - 1, 1)
+    for above, below in zip(rank, rank[1:]):
+        n = won_games[above] + won_games[below]
+        if n == 0 or _binomial_tail(won_games[above], n) > alpha:
+            return False
+    return True
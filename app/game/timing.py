@@ -0,0 +1,128 @@
+import time
+from typing import Dict
+
+# Phases of a round, in the order boards play them
+ROUND_PHASES = ("respond", "scan", "missiles", "explosions", "move")
+# Phases of a game outside its rounds, timed by `Executor`
+GAME_PHASES = ("setup", "stalemate")
+
+
+# Wall and CPU seconds spent in every phase of the games of a match, plus the
+# time of the `respond` calls of every robot. CPU time of phases is the one
+# of the thread playing the game; robots respond in their own threads, so
+# their CPU time only shows up per robot.
+class PhaseTimes:
+    def __init__(self):
+        self.rounds = 0
+        self.wall: Dict[str, float] = {p: 0.0 for p in ROUND_PHASES + GAME_PHASES}
+        self.cpu: Dict[str, float] = {p: 0.0 for p in ROUND_PHASES + GAME_PHASES}
+        # Robot id -> [calls, wall, cpu]
+        self.respond: Dict = {}
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    def start(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    # Adds the time since the last `start` or `lap` to `phase`
+    def lap(self, phase: str):
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        self.wall[phase] += wall - self._wall
+        self.cpu[phase] += cpu - self._cpu
+        self._wall = wall
+        self._cpu = cpu
+
+    def add_respond(self, r_id, wall: float, cpu: float):
+        calls = self.respond.setdefault(r_id, [0, 0.0, 0.0])
+        calls[0] += 1
+        calls[1] += wall
+        calls[2] += cpu
+
+    def merge(self, other: "PhaseTimes"):
+        self.rounds += other.rounds
+        for p in other.wall:
+            self.wall[p] += other.wall[p]
+            self.cpu[p] += other.cpu[p]
+        for r_id, (calls, wall, cpu) in other.respond.items():
+            mine = self.respond.setdefault(r_id, [0, 0.0, 0.0])
+            mine[0] += calls
+            mine[1] += wall
+            mine[2] += cpu
+
+    def summary(self) -> Dict:
+        return {
+            "rounds": self.rounds,
+            "phases": {
+                p: {"wall": self.wall[p], "cpu": self.cpu[p]} for p in self.wall
+            },
+            "respond": {
+                str(r_id): {"calls": calls, "wall": wall, "cpu": cpu}
+                for r_id, (calls, wall, cpu) in self.respond.items()
+            },
+        }
+
+    def __str__(self):
+        total = sum(self.wall.values()) or 1
+        phases = ", ".join(
+            f"{p} {1000 * self.wall[p]:.1f}/{1000 * self.cpu[p]:.1f} ms "
+            f"({100 * self.wall[p] / total:.0f}%)"
+            for p in self.wall
+        )
+        robots = ", ".join(
+            f"{r_id} {1e6 * wall / calls:.0f}/{1e6 * cpu / calls:.0f} us"
+            for r_id, (calls, wall, cpu) in self.respond.items()
+        )
+        return (
+            f"{self.rounds} rounds, wall/cpu per phase: {phases}; "
+            f"respond wall/cpu per call: {robots}"
+        )
+
+
+# Lap of boards that are not timed
+def skip_lap(phase: str):
+    pass
+
+
+# Stands in for the worker of a robot, timing its `respond` calls. CPU time
+# is taken inside the worker thread, where the robot code runs.
+class TimedWorker:
+    def __init__(self, worker, r_id, times: PhaseTimes):
+        self.worker = worker
+        self.r_id = r_id
+        self.times = times
+
+    def call(self, timeout: float, func):
+        cpu = [0.0]
+
+        def timed():
+            start = time.thread_time()
+            try:
+                return func()
+            finally:
+                cpu[0] = time.thread_time() - start
+
+        start = time.perf_counter()
+        try:
+            return self.worker.call(timeout, timed)
+        finally:
+            self.times.add_respond(self.r_id, time.perf_counter() - start, cpu[0])
+
+    def close(self):
+        self.worker.close()
+
+
+# Makes `board` time its rounds into `times`, its `next_round` gets replaced
+# with one passing `times.lap`
+def enable_timing(board, times: PhaseTimes):
+    next_round = board.next_round
+
+    def timed_next_round():
+        times.start()
+        next_round(times.lap)
+        times.rounds += 1
+
+    board.next_round = timed_next_round
+    ids = {r._board_id: r._id for r in board.robots}
+    board.workers = {i: TimedWorker(w, ids[i], times) for i, w in board.workers.items()}
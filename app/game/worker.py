@@ -0,0 +1,68 @@
+import threading
+
+from func_timeout import FunctionTimedOut, StoppableThread, func_timeout
+
+
+# Long-lived thread that runs every call of a single robot.
+# Calls are handed over with a pair of locks and the caller waits for the
+# result until the deadline; when it is missed the thread is killed the same
+# way `func_timeout` kills its one-shot threads.
+class RobotWorker(StoppableThread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self._func = None
+        self._result = None
+        self._closed = False
+        # Both locks start taken: `_go` is released by the caller to hand over
+        # `_func`, `_done` is released by the worker once `_result` is ready
+        self._go = threading.Lock()
+        self._go.acquire()
+        self._done = threading.Lock()
+        self._done.acquire()
+        self.start()
+
+    def run(self):
+        try:
+            while True:
+                self._go.acquire()
+                func = self._func
+                if func is None:
+                    return
+                try:
+                    self._result = (func(), None)
+                except Exception as e:
+                    self._result = (None, e)
+                self._done.release()
+        except FunctionTimedOut:
+            # Killed after missing a deadline
+            return
+
+    def call(self, timeout: float, func):
+        self._func = func
+        self._go.release()
+        if not self._done.acquire(timeout=timeout):
+            self.close()
+            self._stopThread(FunctionTimedOut)
+            raise FunctionTimedOut("", timeout, func)
+        ret, exc = self._result
+        self._result = None
+        if exc is not None:
+            raise exc
+        return ret
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        # An idle thread wakes up and exits, a busy one exits after its call
+        self._func = None
+        self._go.release()
+
+
+# Spawns a new thread for every call, kept to compare against `RobotWorker`
+class OneShotWorker:
+    def call(self, timeout: float, func):
+        return func_timeout(timeout, func)
+
+    def close(self):
+        return
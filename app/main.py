@@ -2,7 +2,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from app.game import MATCH_PROCS
+from app.game.host import warm_up
 from app.util.assets import ASSETS_DIR
+from app.views.matches import resume_matches
 from app.views.matches import router as MatchesRouter
 from app.views.robots import router as RobotRouter
 from app.views.simulate import router as SimulateRouter
@@ -42,6 +45,13 @@ app.mount(
 )
 
 
+@app.on_event("startup")
+def startup():
+    if MATCH_PROCS > 1:
+        warm_up()
+    resume_matches()
+
+
 @app.get("/")
 def root():
     return {"msg": "Welcome to PyRobots!"}
@@ -1,7 +1,10 @@
 from .database import *
 from .match import *
+from .match_checkpoint import *
+from .match_timings import *
 from .robot import *
 from .robot_result import *
 from .user import *
 
+add_missing_columns(db)
 db.generate_mapping(create_tables=True)
@@ -1,6 +1,56 @@
-from pony.orm import Database
+from pony.orm import Database, db_session
 
 from app.dbconfig import *
 
 db = Database()
+
+
+# Applies `db_pragmas` to every new connection
+def set_pragmas(db, connection):
+    cursor = connection.cursor()
+    for name, value in db_pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+db.on_connect(provider="sqlite")(set_pragmas)
 db.bind(**db_config)
+
+
+# Columns added to tables after their first release. Pony creates missing
+# tables but never alters existing ones, so databases created before a column
+# or an index get it here, before the mapping is checked against them.
+ADDED_COLUMNS = {
+    "Match": {
+        "stop_confidence": "REAL",
+        "games_played": "INTEGER",
+        "stop_reason": "VARCHAR(16)",
+    },
+}
+
+
+# Indexes added to tables after their first release, named as Pony names them
+ADDED_INDEXES = {
+    "Match": {"idx_match__state_id": ("state", "id")},
+    "RobotMatchResult": {"idx_robotmatchresult__match_id": ("match_id",)},
+}
+
+
+def add_missing_columns(db: Database):
+    with db_session(ddl=True):
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {c[1] for c in db.execute(f'PRAGMA table_info("{table}")')}
+            # New databases get the whole table from Pony
+            if not existing:
+                continue
+            for name, sql_type in columns.items():
+                if name not in existing:
+                    db.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {sql_type}')
+
+        for table, indexes in ADDED_INDEXES.items():
+            if not db.execute(f'PRAGMA table_info("{table}")').fetchall():
+                continue
+            for name, columns in indexes.items():
+                columns = ", ".join(f'"{c}"' for c in columns)
+                db.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({columns})'
+                )
@@ -1,4 +1,4 @@
-from pony.orm import Optional, PrimaryKey, Required, Set
+from pony.orm import Optional, PrimaryKey, Required, Set, composite_index
 
 from app.models.database import db
 
@@ -15,3 +15,9 @@ class Match(db.Entity):
     plays = Set("Robot", reverse="matches_in")
     state = Required(str, 8, default="Lobby")
     password = Optional(str)
+    # Early stopping of the games, disabled without a confidence
+    stop_confidence = Optional(float)
+    games_played = Optional(int)
+    stop_reason = Optional(str, 16, nullable=True)
+    # Listings filter on the state and page by id
+    composite_index(state, id)
@@ -0,0 +1,11 @@
+from pony.orm import Json, PrimaryKey, Required
+
+from app.models.database import db
+
+
+# Counters of the games of an "InGame" match played so far, keyed by robot id
+class MatchCheckpoint(db.Entity):
+    match_id = PrimaryKey(int)
+    games_played = Required(int)
+    won_games = Required(Json)
+    survived_games = Required(Json)
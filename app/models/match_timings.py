@@ -0,0 +1,10 @@
+from pony.orm import Json, PrimaryKey, Required
+
+from app.models.database import db
+
+
+# Time spent in every phase of the games of a finished match, as given by
+# `PhaseTimes.summary`. Only kept for matches played with timing enabled.
+class MatchTimings(db.Entity):
+    match_id = PrimaryKey(int)
+    timings = Required(Json)
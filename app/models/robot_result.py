@@ -6,7 +6,8 @@ from app.models.database import db
 class RobotMatchResult(db.Entity):
     id = PrimaryKey(int, auto=True)
     robot_id = Required(int)
-    match_id = Required(int)
+    # Results are looked up by match, the key covers lookups by robot
+    match_id = Required(int, index=True)
     position = Required(int)
     death_count = Required(int)
     composite_key(robot_id, match_id)
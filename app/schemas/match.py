@@ -1,6 +1,6 @@
 from typing import Dict, List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 
 
 class MatchCreateRequest(BaseModel):
@@ -11,6 +11,15 @@ class MatchCreateRequest(BaseModel):
     rounds: int
     games: int
     password: str
+    # Stop playing games once the ranking is settled with this confidence.
+    # With 1 games only stop when no remaining game can change the ranking.
+    stop_confidence: float | None = None
+
+    @validator("stop_confidence")
+    def validate_stop_confidence(cls, v):
+        if v is None or 0 < v <= 1:
+            return v
+        raise ValueError("invalid stop confidence")
 
 
 class MatchJoinRequest(BaseModel):
@@ -46,3 +55,18 @@ class MatchResponse(BaseModel):
     robots: Dict[int, RobotInMatch]
     state: str
     results: Dict[int, RobotResult] | None
+    games_played: int | None
+    stop_reason: str | None
+
+
+class MatchQueueReport(BaseModel):
+    workers: int
+    queued: int
+    running: int
+    finished: int
+    # Matches whose job raised, they are not counted as finished
+    failed: int
+    # Seconds waited by the oldest queued match and on average by the last
+    # started ones
+    oldest_wait: float
+    average_wait: float
@@ -6,11 +6,17 @@ from app.schemas.match import RobotInMatch
 
 MAX_BOTS = 4
 MAX_ROUNDS = 10000
+# Seeds stay below the integers JavaScript can represent exactly
+MAX_SEED = 2**53
 
 
 class SimulationRequest(BaseModel):
     rounds: int | None
     robots: List[Any]
+    # Respond with the compact encoding of `app.game.replay`
+    compact: bool = False
+    # Same seed and robot code, same simulation. A random one when missing.
+    seed: int | None = None
 
     @validator("rounds")
     def validate_rounds(cls, v):
@@ -18,6 +24,12 @@ class SimulationRequest(BaseModel):
             return v
         raise ValueError("invalid amount of rounds")
 
+    @validator("seed")
+    def validate_seed(cls, v):
+        if v is None or 0 <= v < MAX_SEED:
+            return v
+        raise ValueError("invalid seed")
+
     @validator("robots")
     def validate_robots(cls, v):
         if 0 < len(v) <= MAX_BOTS:
@@ -45,4 +57,5 @@ class Round(BaseModel):
 
 class SimulationResponse(BaseModel):
     robots: Dict[Any, RobotInMatch]
+    seed: int
     rounds: List[Round]
@@ -6,11 +6,13 @@ from ast import (
     Import,
     ImportFrom,
     Load,
+    Module,
     Name,
     parse,
     walk,
 )
 
+from app.game.array_board import ROBOT_VIEW_VARS
 from app.game.entities import Robot
 from app.util.errors import (
     ROBOT_CODE_CLASSES_ERROR,
@@ -41,10 +43,11 @@ ROBOT_PRIV_FUNCS = {f for f in ROBOT_FINAL_FUNCS if f.startswith("_")}
 
 del Robot.__abstractmethods__
 r = Robot(0, 0, (0, 0))
-ROBOT_PRIV_VARS = {v for v in vars(r).keys()}
+ROBOT_PRIV_VARS = {v for v in vars(r).keys()} | ROBOT_VIEW_VARS
 
 
-def check_code(src: bytes):
+# Returns the parsed code, ready for `app.game.loader.compile_robot`
+def check_code(src: bytes | str) -> Module:
     tree = parse(src)
 
     methods = set()
@@ -89,4 +92,4 @@ def check_code(src: bytes):
 
     if methods != ROBOT_ABSTR_FUNCS:
         raise ROBOT_CODE_UNIMPLEMENTED_ERROR
-    return
+    return tree
@@ -1,48 +1,105 @@
-from pony.orm import db_session, select
+import os
+from typing import Dict, List
+
+from pony.orm import commit, db_session, select
 
 from app.models.match import Match
+from app.models.match_checkpoint import MatchCheckpoint
 from app.models.robot_result import RobotMatchResult
 from app.schemas.match import Host, MatchResponse, RobotInMatch, RobotResult
 from app.util.assets import get_robot_avatar, get_user_avatar
 from app.util.errors import MATCH_NOT_FOUND_ERROR
 
+# Rows returned by listings when the client does not ask for a page size,
+# and the most it can ask for
+PAGE_SIZE = int(os.environ.get("PYROBOTS_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.environ.get("PYROBOTS_MAX_PAGE_SIZE", "200"))
 
-def match_id_to_schema(match_id: int):
-    robots = {}
-    with db_session:
-        match = Match.get(id=match_id)
-        if not match:
-            raise MATCH_NOT_FOUND_ERROR
-        for r in match.plays:
-            r_avatar = get_robot_avatar(r)
-            robots[r.id] = RobotInMatch(
-                name=r.name, avatar_url=r_avatar, username=r.owner.name
-            )
 
-        results = None
-        if match.state == "Finished":
-            robot_results = select(
-                r for r in RobotMatchResult if r.match_id == match.id
-            )
-            results = {
-                r.robot_id: RobotResult(
+# Keyset pagination on id: the first `limit` entities of `query` with an id
+# greater than `after`. Clients get the next page passing the last id they
+# got as `after`.
+def id_page(query, after: int | None, limit: int) -> List:
+    if after is not None:
+        query = query.filter(lambda x: x.id > after)
+    return query.order_by(lambda x: x.id)[:limit]
+
+
+# Schemas of many matches at once, in the order of `match_ids`. Matches,
+# their robots, the robot owners, the hosts and the results are loaded with
+# a fixed number of queries, however many matches there are. Missing matches
+# are left out.
+def matches_to_schemas(match_ids: List[int]) -> List[MatchResponse]:
+    with db_session:
+        matches = select(m for m in Match if m.id in match_ids).prefetch(
+            Match.host, Match.plays
+        )[:]
+        finished = [m.id for m in matches if m.state == "Finished"]
+        results: Dict[int, Dict] = {m_id: {} for m_id in finished}
+        if finished:
+            for r in select(r for r in RobotMatchResult if r.match_id in finished):
+                results[r.match_id][r.robot_id] = RobotResult(
                     robot_pos=r.position,
                     death_count=r.death_count,
                 )
-                for r in robot_results
+
+        by_id = {}
+        for match in matches:
+            robots = {
+                r.id: RobotInMatch(
+                    name=r.name, avatar_url=get_robot_avatar(r), username=r.owner.name
+                )
+                for r in match.plays
             }
+            h_avatar = get_user_avatar(match.host)
+            by_id[match.id] = MatchResponse(
+                id=match.id,
+                host=Host(username=match.host.name, avatar_url=h_avatar),
+                name=match.name,
+                max_players=match.max_players,
+                min_players=match.min_players,
+                games=match.game_count,
+                rounds=match.round_count,
+                state=match.state,
+                is_private=match.password != "",
+                robots=robots,
+                results=results.get(match.id),
+                games_played=match.games_played,
+                stop_reason=match.stop_reason,
+            )
+    return [by_id[m_id] for m_id in match_ids if m_id in by_id]
+
+
+def match_id_to_schema(match_id: int) -> MatchResponse:
+    schemas = matches_to_schemas([match_id])
+    if not schemas:
+        raise MATCH_NOT_FOUND_ERROR
+    return schemas[0]
 
-        h_avatar = get_user_avatar(match.host)
-        return MatchResponse(
-            id=match.id,
-            host=Host(username=match.host.name, avatar_url=h_avatar),
-            name=match.name,
-            max_players=match.max_players,
-            min_players=match.min_players,
-            games=match.game_count,
-            rounds=match.round_count,
-            state=match.state,
-            is_private=match.password != "",
-            robots=robots,
-            results=results,
+
+# Counters of the games already played by a match, as `Executor.counters`
+def load_match_checkpoint(match_id: int, robot_ids: List):
+    with db_session:
+        c = MatchCheckpoint.get(match_id=match_id)
+        if c is None:
+            return (0, {}, {})
+        # JSON keys are always strings
+        return (
+            c.games_played,
+            {r: c.won_games.get(str(r), 0) for r in robot_ids},
+            {r: c.survived_games.get(str(r), 0) for r in robot_ids},
         )
+
+
+def save_match_checkpoint(match_id: int, counters):
+    games_played, won_games, survived_games = counters
+    with db_session:
+        c = MatchCheckpoint.get(match_id=match_id)
+        if c is None:
+            c = MatchCheckpoint(
+                match_id=match_id, games_played=0, won_games={}, survived_games={}
+            )
+        c.games_played = games_played
+        c.won_games = {str(r): n for r, n in won_games.items()}
+        c.survived_games = {str(r): n for r, n in survived_games.items()}
+        commit()
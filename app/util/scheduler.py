@@ -0,0 +1,87 @@
+import collections
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict
+
+# Matches executed at the same time
+MATCH_WORKERS = int(os.environ.get("PYROBOTS_MATCH_WORKERS", "2"))
+# Started matches kept to average their wait time
+WAIT_SAMPLES = 100
+
+logger = logging.getLogger(__name__)
+
+
+# Runs match jobs on its own pool of worker threads, away from the threadpool
+# that serves requests. Submitting never blocks: matches wait in the queue
+# until a worker is free. The queue lives in memory, the database keeps the
+# matches that are still "InGame" so they can be submitted again on startup.
+class MatchScheduler:
+    def __init__(self, job: Callable[[int], None], workers: int = MATCH_WORKERS):
+        self._job = job
+        self._workers = workers
+        self._threads = []
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        # Match id -> time it was submitted, for matches not started yet
+        self._queued: Dict[int, float] = {}
+        self._running = set()
+        self._waits = collections.deque(maxlen=WAIT_SAMPLES)
+        self._finished = 0
+        self._failed = 0
+
+    # Returns False if the match was already queued or running
+    def submit(self, match_id: int) -> bool:
+        with self._lock:
+            if match_id in self._queued or match_id in self._running:
+                return False
+            self._queued[match_id] = time.monotonic()
+            # Workers start with the first match
+            while len(self._threads) < self._workers:
+                t = threading.Thread(target=self._run, daemon=True)
+                t.start()
+                self._threads.append(t)
+        self._queue.put(match_id)
+        return True
+
+    def _run(self):
+        while True:
+            match_id = self._queue.get()
+            with self._lock:
+                self._waits.append(time.monotonic() - self._queued.pop(match_id))
+                self._running.add(match_id)
+            failed = False
+            try:
+                self._job(match_id)
+            except Exception:
+                # The match stays "InGame" and is retried on the next startup
+                logger.exception(f"Match {match_id} failed")
+                failed = True
+            finally:
+                with self._lock:
+                    self._running.discard(match_id)
+                    if failed:
+                        self._failed += 1
+                    else:
+                        self._finished += 1
+                self._queue.task_done()
+
+    # Blocks until every submitted match was executed
+    def join(self):
+        self._queue.join()
+
+    def report(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            waits = list(self._waits)
+            return {
+                "workers": self._workers,
+                "queued": len(self._queued),
+                "running": len(self._running),
+                "finished": self._finished,
+                "failed": self._failed,
+                "oldest_wait": max((now - t for t in self._queued.values()), default=0),
+                "average_wait": sum(waits) / len(waits) if waits else 0,
+            }
@@ -1,23 +1,37 @@
 import asyncio
+import logging
 from enum import Enum
 from typing import Dict
 
-from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, WebSocket, status
-from pony.orm import commit, db_session, select
+from fastapi import APIRouter, Header, HTTPException, Query, WebSocket, status
+from pony.orm import commit, count, db_session, select
 from websockets.exceptions import WebSocketException
 
+from app.game import MATCH_TIMING
 from app.game.executor import Executor
 from app.models.match import Match
+from app.models.match_checkpoint import MatchCheckpoint
+from app.models.match_timings import MatchTimings
 from app.models.robot import Robot
 from app.models.robot_result import RobotMatchResult
 from app.models.user import User
-from app.schemas.match import MatchCreateRequest, MatchJoinRequest
+from app.schemas.match import MatchCreateRequest, MatchJoinRequest, MatchQueueReport
 from app.util.auth import get_current_user
-from app.util.db_access import match_id_to_schema
+from app.util.db_access import (
+    MAX_PAGE_SIZE,
+    PAGE_SIZE,
+    id_page,
+    load_match_checkpoint,
+    match_id_to_schema,
+    matches_to_schemas,
+    save_match_checkpoint,
+)
 from app.util.errors import *
+from app.util.scheduler import MatchScheduler
 from app.util.ws import Notifier
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 class MatchType(str, Enum):
@@ -28,7 +42,17 @@ class MatchType(str, Enum):
 
 
 @router.get("/")
-def get_matches(match_type: MatchType, token: str = Header()):
+def get_matches(
+    match_type: MatchType,
+    token: str = Header(),
+    after: int | None = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    free_slots: bool | None = None,
+    private: bool | None = None,
+    min_players: int | None = None,
+    max_players: int | None = None,
+    name: str | None = None,
+):
     username = get_current_user(token)
 
     with db_session:
@@ -38,33 +62,46 @@ def get_matches(match_type: MatchType, token: str = Header()):
 
         queries: Dict = {
             MatchType.created: select(
-                m.id for m in Match if m.state == "Lobby" and m.host is cur_user
+                m for m in Match if m.state == "Lobby" and m.host is cur_user
             ),
             MatchType.started: select(
-                m.id
+                m
                 for m in Match
                 if (m.state == "InGame" or m.state == "Finished")
                 and cur_user in m.plays.owner
             ),
             MatchType.joined: select(
-                m.id
+                m
                 for m in Match
                 if m.state == "Lobby"
                 and cur_user in m.plays.owner
                 and m.host is not cur_user
             ),
             MatchType.public: select(
-                m.id for m in Match if m.state == "Lobby" and m.host is not cur_user
+                m for m in Match if m.state == "Lobby" and m.host is not cur_user
             ),
         }
 
-        queried_matches = queries[match_type][:]
-
-        matches = []
-        for m in queried_matches:
-            matches.append(match_id_to_schema(m))
-
-    return matches
+        query = queries[match_type]
+        if free_slots is not None:
+            if free_slots:
+                query = query.filter(lambda m: count(m.plays) < m.max_players)
+            else:
+                query = query.filter(lambda m: count(m.plays) >= m.max_players)
+        if private is not None:
+            if private:
+                query = query.filter(lambda m: m.password != "")
+            else:
+                query = query.filter(lambda m: m.password == "")
+        # Matches whose player limits are within the bounds
+        if min_players is not None:
+            query = query.filter(lambda m: m.min_players >= min_players)
+        if max_players is not None:
+            query = query.filter(lambda m: m.max_players <= max_players)
+        if name:
+            query = query.filter(lambda m: m.name.startswith(name))
+
+        return matches_to_schemas([m.id for m in id_page(query, after, limit)])
 
 
 @router.post("/", status_code=201)
@@ -94,10 +131,17 @@ def create_match(form_data: MatchCreateRequest, token: str = Header()):
             round_count=form_data.rounds,
             state="Lobby",
             password=form_data.password,
+            stop_confidence=form_data.stop_confidence,
         )
         commit()
 
 
+@router.get("/queue/", response_model=MatchQueueReport)
+def get_match_queue(token: str = Header()):
+    get_current_user(token)
+    return scheduler.report()
+
+
 @router.get("/{match_id}/")
 def get_match(match_id: int, token: str = Header()):
     get_current_user(token)
@@ -162,40 +206,55 @@ def execute_match(match_id: int):
         m = Match.get(id=match_id)
         robot_ids = [r.id for r in m.plays]
         game_count, round_count = m.game_count, m.round_count
-
-    exec = Executor(robot_ids)
-    for _ in range(game_count):
-        exec.execute_game(round_count)
+        stop_confidence = m.stop_confidence
+
+    # Resume from the last checkpoint of the match, if it has one
+    exec = Executor(robot_ids, timing=MATCH_TIMING)
+    exec.merge_counters(load_match_checkpoint(match_id, robot_ids))
+    exec.execute_games(
+        game_count - exec.games_execd,
+        round_count,
+        checkpoint=lambda counters: save_match_checkpoint(match_id, counters),
+        stop_confidence=stop_confidence,
+    )
 
     robots_by_pos, death_counts = exec.generate_stats()
 
+    # Results, counters and the state of the match change in one transaction,
+    # readers never see a finished match without its results
     with db_session:
-        m = Match.get(id=match_id)
-        m.state = "Finished"
-        commit()
-
-    for rid in robot_ids:
-        with db_session:
+        robots = {r.id: r for r in select(r for r in Robot if r.id in robot_ids)}
+        for rid in robot_ids:
             RobotMatchResult(
                 robot_id=rid,
                 match_id=match_id,
                 position=robots_by_pos.index(rid) + 1,
                 death_count=death_counts[rid],
             )
-            r = Robot[rid]
-            r.played_matches += 1
-            commit()
-
-    with db_session:
-        Robot[robots_by_pos[0]].won_matches += 1
-        Robot[robots_by_pos[0]].mmr += 20
+            robots[rid].played_matches += 1
 
+        winner = robots[robots_by_pos[0]]
+        winner.won_matches += 1
+        winner.mmr += 20
         for rid in robots_by_pos[1:]:
-            robot = Robot[rid]
-            robot.mmr = max(robot.mmr - 10, 0)
+            robots[rid].mmr = max(robots[rid].mmr - 10, 0)
 
+        m = Match.get(id=match_id)
+        m.state = "Finished"
+        m.games_played = exec.games_execd
+        m.stop_reason = exec.stop_reason
+
+        checkpoint = MatchCheckpoint.get(match_id=match_id)
+        if checkpoint is not None:
+            checkpoint.delete()
+        # Games played before resuming from a checkpoint were not timed here
+        if exec.times is not None:
+            MatchTimings(match_id=match_id, timings=exec.times.summary())
         commit()
 
+    if exec.times is not None:
+        logger.info(f"Match {match_id} timings: {exec.times}")
+
     # Notify websockets
     chan = channels.get(match_id)
 
@@ -204,8 +263,19 @@ def execute_match(match_id: int):
         asyncio.run(chan.push(match.dict()))
 
 
+scheduler = MatchScheduler(execute_match)
+
+
+# Submits the matches left "InGame" by a previous run of the server
+def resume_matches():
+    with db_session:
+        match_ids = select(m.id for m in Match if m.state == "InGame")[:]
+    for match_id in match_ids:
+        scheduler.submit(match_id)
+
+
 @router.put("/{match_id}/start/", status_code=201)
-def start_match(bg_tasks: BackgroundTasks, match_id: int, token: str = Header()):
+def start_match(match_id: int, token: str = Header()):
     username = get_current_user(token)
 
     with db_session:
@@ -232,7 +302,7 @@ def start_match(bg_tasks: BackgroundTasks, match_id: int, token: str = Header())
         m.state = "InGame"
         commit()
 
-    bg_tasks.add_task(execute_match, match_id)
+    scheduler.submit(match_id)
 
     # Notify websockets
     chan = channels.get(match_id)
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Header, HTTPException, UploadFile
+from fastapi import APIRouter, Header, HTTPException, Query, UploadFile
 from pony.orm import commit, db_session, select
 
+from app.game.loader import robot_loader
 from app.models.robot import Robot
 from app.models.user import User
 from app.schemas.robot import RobotCode, RobotDetails, RobotResponse
 from app.util.assets import ASSETS_DIR, get_robot_avatar
 from app.util.auth import get_current_user
 from app.util.check_code import check_code
+from app.util.db_access import MAX_PAGE_SIZE, PAGE_SIZE, id_page
 from app.util.errors import *
 
 router = APIRouter()
 
 
 @router.get("/")
-def get_robots(token: str = Header()):
+def get_robots(
+    token: str = Header(),
+    after: int | None = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
     username = get_current_user(token)
 
     with db_session:
@@ -23,7 +29,8 @@ def get_robots(token: str = Header()):
             raise USER_NOT_FOUND_ERROR
 
         robots = []
-        for robot in select(r for r in Robot if r.owner.name == username):
+        query = select(r for r in Robot if r.owner.name == username)
+        for robot in id_page(query, after, limit):
             robots.append(
                 RobotResponse(
                     robot_id=robot.id,
@@ -46,7 +53,7 @@ def create_robot(
     src = code.file.read()
 
     try:
-        check_code(src)
+        tree = check_code(src)
     except SyntaxError:
         raise ROBOT_CODE_SYNTAX_ERROR
 
@@ -65,9 +72,7 @@ def create_robot(
         robot = Robot(owner=user, name=name, has_avatar=avatar is not None)
         commit()
 
-    with open(f"{ASSETS_DIR}/robots/code/{robot.id}.py", "wb") as f:
-        f.write(b"from app.game.entities import Robot\n")
-        f.write(src)
+    robot_loader.save(robot.id, src, tree)
 
     if avatar:
         with open(f"{ASSETS_DIR}/robots/avatars/{robot.id}.png", "wb") as f:
@@ -121,11 +126,8 @@ def update_robot_code(robot_id: int, code: RobotCode, token: str = Header()):
             raise ROBOT_NOT_FROM_USER_ERROR
 
     try:
-        pass
-        check_code(code.code)
+        tree = check_code(code.code)
     except SyntaxError:
         raise ROBOT_CODE_SYNTAX_ERROR
 
-    with open(f"{ASSETS_DIR}/robots/code/{robot_id}.py", "w") as f:
-        f.write("from app.game.entities import Robot\n")
-        f.write(code.code)
+    robot_loader.save(robot_id, code.code.encode(), tree)
@@ -1,23 +1,76 @@
-from fastapi import APIRouter, Header, HTTPException
+import json
+import os
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pony.orm import db_session
 
 from app.game.executor import Executor
+from app.game.recorder import Recorder, round_json
+from app.game.replay import encode_replay
 from app.models.robot import Robot
 from app.models.user import User
 from app.schemas.match import RobotInMatch
-from app.schemas.simulation import SimulationRequest, SimulationResponse
+from app.schemas.simulation import MAX_SEED, SimulationRequest, SimulationResponse
 from app.util.assets import ASSETS_DIR, get_robot_avatar
 from app.util.auth import get_current_user
 from app.util.errors import *
 
 DEFAULT_ROUNDS = 100
+# Rounds sent together by `simulate_stream`
+STREAM_BATCH_ROUNDS = 20
 BOT_DIR = f"{ASSETS_DIR}/robots"
+# Finished simulations kept to answer the same request again
+SIMULATION_CACHE_SIZE = int(os.environ.get("PYROBOTS_SIMULATION_CACHE", "16"))
+# Longest simulations cached, longer ones are not kept in memory
+SIMULATION_CACHE_ROUNDS = 1000
 
 router = APIRouter()
 
+# Recordings keyed by the code hashes of the robots, in order, the rounds
+# and the seed: seeded games always play the same way (see
+# `Executor.simulate_iter`), so a repeated request needs no game at all
+SimulationKey = Tuple[Tuple[str, ...], int, int]
+_simulations: OrderedDict[SimulationKey, Recorder] = OrderedDict()
+_simulations_lock = threading.Lock()
 
-@router.post("/")
-def simulate(schema: SimulationRequest, token: str = Header()):
+
+def cached_simulation(key: SimulationKey) -> Recorder | None:
+    with _simulations_lock:
+        recording = _simulations.get(key)
+        if recording is not None:
+            _simulations.move_to_end(key)
+        return recording
+
+
+def cache_simulation(key: SimulationKey, recording: Recorder):
+    with _simulations_lock:
+        _simulations[key] = recording
+        _simulations.move_to_end(key)
+        while len(_simulations) > SIMULATION_CACHE_SIZE:
+            _simulations.popitem(last=False)
+
+
+def simulation_key(exec: Executor, rounds: int, seed: int) -> SimulationKey:
+    return (tuple(exec.code_hashes), rounds, seed)
+
+
+# Only games the client may ask for again are worth keeping: the ones with a
+# seed of its own, and not too long
+def worth_caching(schema: SimulationRequest, rounds: int) -> bool:
+    return schema.seed is not None and rounds <= SIMULATION_CACHE_ROUNDS
+
+
+def request_seed(schema: SimulationRequest) -> int:
+    return schema.seed if schema.seed is not None else random.randrange(MAX_SEED)
+
+
+# Metadata of the requested robots, checking that the user owns all of them
+def get_robots_header(schema: SimulationRequest, token: str) -> Dict:
     username = get_current_user(token)
 
     robots = {}
@@ -42,7 +95,83 @@ def simulate(schema: SimulationRequest, token: str = Header()):
                 name=r.name, avatar_url=r_avatar, username=r.owner.name
             )
 
+    return {i: r.dict() for i, r in robots.items()}
+
+
+@router.post("/", response_model=SimulationResponse)
+def simulate(schema: SimulationRequest, token: str = Header()):
+    header = get_robots_header(schema, token)
+    rounds = schema.rounds if schema.rounds is not None else DEFAULT_ROUNDS
+    seed = request_seed(schema)
+
+    exec = Executor(schema.robots)
+    key = simulation_key(exec, rounds, seed)
+    recording = cached_simulation(key)
+    if recording is None:
+        recording = exec.simulate(rounds, seed)
+        if worth_caching(schema, rounds):
+            cache_simulation(key, recording)
+
+    if schema.compact:
+        return Response(
+            content=json.dumps({**encode_replay(recording, header), "seed": seed}),
+            media_type="application/json",
+        )
+    # Serialized straight from the recording instead of building a
+    # `SimulationResponse`, which is only kept to document the response
+    return Response(
+        content=recording.to_json(header, seed), media_type="application/json"
+    )
+
+
+# Streams a cached recording of the game if there is one. Otherwise plays
+# it, recording it to be cached only when `record` is set.
+def stream_rounds(
+    exec: Executor, header: Dict, rounds: int, seed: int, record: bool = False
+) -> Iterator[str]:
+    yield json.dumps({"robots": header, "seed": seed}) + "\n"
+
+    key = simulation_key(exec, rounds, seed)
+    recording = cached_simulation(key)
+    if recording is not None:
+        lines = (r + "\n" for r in recording.iter_rounds_json())
+    elif not record:
+        lines = (
+            round_json(*frame) + "\n" for frame in exec.simulate_iter(rounds, seed)
+        )
+    else:
+        # Recorded while streaming, cached only if the game gets to the end
+        recording = Recorder(len(exec.robot_classes), rounds)
+
+        def play():
+            for frame in exec.simulate_iter(rounds, seed):
+                recording.record(*frame)
+                yield round_json(*frame) + "\n"
+            cache_simulation(key, recording)
+
+        lines = play()
+
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == STREAM_BATCH_ROUNDS:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+# Same simulation as `simulate`, streamed as newline delimited JSON: the
+# first line holds the robots of the simulation and every other line is a
+# round, sent in small batches while the game is still running
+@router.post("/stream/")
+def simulate_stream(schema: SimulationRequest, token: str = Header()):
+    header = get_robots_header(schema, token)
     rounds = schema.rounds if schema.rounds is not None else DEFAULT_ROUNDS
 
     exec = Executor(schema.robots)
-    return SimulationResponse(robots=robots, rounds=exec.simulate(rounds))
+    record = worth_caching(schema, rounds)
+    return StreamingResponse(
+        stream_rounds(exec, header, rounds, request_seed(schema), record),
+        media_type="application/x-ndjson",
+    )
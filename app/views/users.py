@@ -1,11 +1,19 @@
 from datetime import timedelta
 from shutil import copyfile
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    UploadFile,
+)
 from fastapi.responses import RedirectResponse
 from passlib.context import CryptContext
 from pony.orm import commit, db_session
 
+from app.game.loader import ROBOT_HEADER, robot_loader
 from app.models.robot import Robot
 from app.models.user import User
 from app.schemas.user import (
@@ -20,6 +28,7 @@ from app.schemas.user import (
 )
 from app.util.assets import ASSETS_DIR, get_user_avatar
 from app.util.auth import create_access_token, get_current_user, get_user_and_subject
+from app.util.check_code import check_code
 from app.util.errors import *
 from app.util.mail import send_recovery_mail, send_verification_token
 
@@ -31,8 +40,19 @@ password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 router = APIRouter()
 
 
+# Default robots are stored like uploaded ones, along with their compiled code
+def save_default_robot(r_id: int, name: str):
+    with open(f"{ASSETS_DIR}/defaults/code/{name}.py", "rb") as f:
+        src = f.read().removeprefix(ROBOT_HEADER)
+    robot_loader.save(r_id, src, check_code(src))
+
+
 @router.post("/", status_code=201)
-def register(bg_tasks: BackgroundTasks, schema: Register = Depends(), avatar: UploadFile | None = None):
+def register(
+    bg_tasks: BackgroundTasks,
+    schema: Register = Depends(),
+    avatar: UploadFile | None = None,
+):
     if avatar and avatar.content_type != "image/png":
         raise HTTPException(status_code=422, detail="invalid picture format")
 
@@ -81,19 +101,13 @@ def register(bg_tasks: BackgroundTasks, schema: Register = Depends(), avatar: Up
             f"{ASSETS_DIR}/defaults/avatars/default_1.png",
             f"{ASSETS_DIR}/robots/avatars/{default_1.id}.png",
         )
-        copyfile(
-            f"{ASSETS_DIR}/defaults/code/default_1.py",
-            f"{ASSETS_DIR}/robots/code/{default_1.id}.py",
-        )
+        save_default_robot(default_1.id, "default_1")
 
         copyfile(
             f"{ASSETS_DIR}/defaults/avatars/default_2.png",
             f"{ASSETS_DIR}/robots/avatars/{default_2.id}.png",
         )
-        copyfile(
-            f"{ASSETS_DIR}/defaults/code/default_2.py",
-            f"{ASSETS_DIR}/robots/code/{default_2.id}.py",
-        )
+        save_default_robot(default_2.id, "default_2")
 
 
 @router.post("/login/", response_model=LoginResponse)
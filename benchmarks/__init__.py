@@ -0,0 +1,49 @@
+import contextlib
+import glob
+import importlib.util
+import inspect
+import os
+from shutil import copyfile
+
+# Same environment `run.py` sets up, benchmarks never touch the real database
+os.environ.setdefault("PYROBOTS_DBFILE", ":memory:")
+os.environ.setdefault("PYROBOTS_ASSETS", "app/assets")
+
+DEFAULTS_DIR = "app/assets/defaults/code"
+
+
+def load_robot_file(path: str):
+    spec = importlib.util.spec_from_file_location(
+        os.path.splitext(os.path.basename(path))[0], path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    classes = inspect.getmembers(module, inspect.isclass)
+    classes = [c for (name, c) in classes if name != "Robot"]
+    assert len(classes) == 1
+    return classes[0]
+
+
+def default_robots():
+    return [
+        load_robot_file(f"{DEFAULTS_DIR}/default_1.py"),
+        load_robot_file(f"{DEFAULTS_DIR}/default_2.py"),
+    ]
+
+
+# Copies the default robots where `Executor` loads robots from, for
+# benchmarks that need robot ids instead of classes
+@contextlib.contextmanager
+def installed_default_robots():
+    code_dir = f"{os.environ['PYROBOTS_ASSETS']}/robots/code"
+    ids = ["benchmark_default_1", "benchmark_default_2"]
+    for i, r_id in enumerate(ids):
+        copyfile(f"{DEFAULTS_DIR}/default_{i + 1}.py", f"{code_dir}/{r_id}.py")
+    try:
+        yield ids
+    finally:
+        for r_id in ids:
+            os.remove(f"{code_dir}/{r_id}.py")
+            # Left by `app.game.loader`
+            for compiled in glob.glob(f"{code_dir}/{r_id}.*.code"):
+                os.remove(compiled)
@@ -0,0 +1,82 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+import benchmarks
+from app.game import entities
+from app.game.board import Board
+
+
+# Fires whenever the cannon is ready, so the board is always full of missiles
+class Gunner(entities.Robot):
+    def initialize(self):
+        self.var = random.uniform(0, 360)
+
+    def respond(self):
+        self.var += 17
+        self.drive(self.var, 20)
+        self.cannon(self.var, 300 + self.var % 400)
+
+
+def measure(robots: int, rounds: int):
+    b = Board([(i, Gunner) for i in range(robots)])
+    # Warm up so that pools and caches are already filled
+    for _ in range(50):
+        b.next_round()
+
+    tracemalloc.start()
+    peaks = 0
+    start_mem, _ = tracemalloc.get_traced_memory()
+    for _ in range(rounds):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        b.next_round()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - before
+    end_mem, _ = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(
+        s.count
+        for s in snapshot.statistics("filename")
+        if "app/game" in s.traceback[0].filename
+    )
+
+    b.close()
+    b = Board([(i, Gunner) for i in range(robots)])
+    start = time.perf_counter()
+    for _ in range(rounds):
+        b.next_round()
+    elapsed = time.perf_counter() - start
+    b.close()
+
+    return {
+        "round_us": elapsed / rounds * 1e6,
+        "peak_bytes_per_round": peaks / rounds,
+        "retained_bytes": end_mem - start_mem,
+        "live_blocks": blocks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-round allocations and time of Board, measured with tracemalloc"
+    )
+    parser.add_argument("--robots", type=int, nargs="+", default=[4, 50])
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    random.seed(418)
+    for n in args.robots:
+        r = measure(n, args.rounds)
+        print(
+            f"robots={n:4} round: {r['round_us']:8.1f} us "
+            f"peak alloc/round: {r['peak_bytes_per_round']:9.0f} B "
+            f"retained: {r['retained_bytes']:8} B "
+            f"live blocks in app/game: {r['live_blocks']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
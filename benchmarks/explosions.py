@@ -0,0 +1,62 @@
+import argparse
+import math
+import random
+import timeit
+
+import benchmarks
+from app.game import *
+from app.game.explosions import explosion_damage
+
+
+# The explosion phase as it used to be: every missile against every robot.
+# Also the reference the vectorized one is tested against.
+def loop_explosion_damage(missiles, robots):
+    dmg = [0] * len(robots)
+    for m in missiles:
+        for i, r in enumerate(robots):
+            d = math.dist(m, r)
+            if d < NEAR_EXPLOSION_RADIUS:
+                dmg[i] += NEAR_EXPLOSION_DMG
+            elif d < MID_EXPLOSION_RADIUS:
+                dmg[i] += MID_EXPLOSION_DMG
+            elif d < FAR_EXPLOSION_RADIUS:
+                dmg[i] += FAR_EXPLOSION_DMG
+    return dmg
+
+
+def random_positions(n: int):
+    return [
+        (random.uniform(0, BOARD_SZ), random.uniform(0, BOARD_SZ)) for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the vectorized explosion phase against the per-missile loop"
+    )
+    parser.add_argument("--robots", type=int, nargs="+", default=[4, 50, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for n in args.robots:
+        # Every robot has one missile exploding this round
+        missiles, robots = random_positions(n), random_positions(n)
+        assert explosion_damage(missiles, robots) == (
+            loop_explosion_damage(missiles, robots)
+        )
+
+        loop = timeit.timeit(
+            lambda: loop_explosion_damage(missiles, robots), number=args.repeat
+        )
+        vectorized = timeit.timeit(
+            lambda: explosion_damage(missiles, robots), number=args.repeat
+        )
+        print(
+            f"robots={n:4} loop: {loop / args.repeat * 1e6:10.1f} us "
+            f"vectorized: {vectorized / args.repeat * 1e6:10.1f} us "
+            f"({loop / vectorized:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
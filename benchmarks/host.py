@@ -0,0 +1,57 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import benchmarks
+from app.game.board import Board
+from app.game.executor import _init_worker, _run_games
+from app.game.host import host_context, warm_up
+
+
+# Time from creating the pool of a match until every process loaded the
+# robots and played a one round game
+def startup_latency(method: str, robot_ids, procs: int) -> float:
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        procs,
+        mp_context=host_context(method),
+        initializer=_init_worker,
+        initargs=(robot_ids, Board),
+    ) as pool:
+        list(pool.map(_run_games, [1] * procs, [1] * procs))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Startup latency of match pools, with and without the warm host"
+    )
+    parser.add_argument("--procs", type=int, default=2)
+    parser.add_argument("--matches", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"procs={args.procs} matches={args.matches}")
+    with benchmarks.installed_default_robots() as robot_ids:
+        # Every process of a spawned pool imports the engine and the modules
+        # of robots from scratch, like a fresh sandbox per match would
+        for method in ["spawn", "fork"]:
+            times = [
+                startup_latency(method, robot_ids, args.procs)
+                for _ in range(args.matches)
+            ]
+            print(f"{method:16}: {1000 * sum(times) / len(times):8.1f} ms/match")
+
+        # The host imports in the background once started, the first match
+        # waits for it
+        warm_up("forkserver")
+        first = startup_latency("forkserver", robot_ids, args.procs)
+        print(f"{'host, first':16}: {1000 * first:8.1f} ms")
+        times = [
+            startup_latency("forkserver", robot_ids, args.procs)
+            for _ in range(args.matches)
+        ]
+        print(f"{'host, warm':16}: {1000 * sum(times) / len(times):8.1f} ms/match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import os
+import time
+
+import benchmarks
+from app.game.executor import Executor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time to play the games of a match with a process pool"
+    )
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument(
+        "--procs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()]
+    )
+    parser.add_argument("--stop-confidence", type=float, default=None)
+    args = parser.parse_args()
+
+    print(f"games={args.games} rounds={args.rounds} cpus={os.cpu_count()}")
+    with benchmarks.installed_default_robots() as robot_ids:
+        base = None
+        for procs in sorted(set(args.procs)):
+            e = Executor(robot_ids)
+            start = time.perf_counter()
+            e.execute_games(
+                args.games, args.rounds, procs, stop_confidence=args.stop_confidence
+            )
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(
+                f"procs={procs:3}: {elapsed:7.2f} s  speedup: {base / elapsed:5.2f}x  "
+                f"games: {e.games_execd} ({e.stop_reason})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import app.schemas.simulation as schemas
+import benchmarks
+from app.game.board import Board
+from app.game.recorder import Recorder
+from app.schemas.match import RobotInMatch
+
+
+# Frames of `rounds` rounds played by the default robots, new games are
+# started whenever one ends so that every round has something to record
+def play(robots: int, rounds: int):
+    classes = benchmarks.default_robots()
+    robot_classes = [(i, classes[i % len(classes)]) for i in range(robots)]
+    frames = []
+    while len(frames) < rounds + 1:
+        b = Board(robot_classes)
+        frames.append(b.frame())
+        while len(b.robots) > 1 and len(frames) < rounds + 1:
+            b.next_round()
+            frames.append(b.frame())
+        b.close()
+    return frames
+
+
+# What `Executor.simulate` and the /simulate/ view did before the recorder
+def with_schemas(header, frames) -> str:
+    rounds = []
+    for robots, missiles in frames:
+        r_summary = {
+            k: schemas.RobotInRound(x=x, y=y, dmg=dmg) for k, x, y, dmg in robots
+        }
+        m_summary = {
+            k: schemas.MissileInRound(sender_id=sender, x=x, y=y, exploding=exploding)
+            for k, sender, x, y, exploding in missiles
+        }
+        rounds.append(schemas.Round(robots=r_summary, missiles=m_summary))
+    return schemas.SimulationResponse(robots=header, rounds=rounds).json()
+
+
+def with_recorder(header, frames) -> str:
+    g = Recorder(len(header), len(frames) - 1)
+    for robots, missiles in frames:
+        g.record(robots, missiles)
+    return g.to_json({k: r.dict() for k, r in header.items()})
+
+
+def measure(func, header, frames):
+    start = time.perf_counter()
+    func(header, frames)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(header, frames)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time and peak memory of recording and serializing a simulation"
+    )
+    parser.add_argument("--robots", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=10000)
+    args = parser.parse_args()
+
+    random.seed(418)
+    frames = play(args.robots, args.rounds)
+    header = {
+        i: RobotInMatch(name=f"robot{i}", avatar_url=None, username="user")
+        for i in range(args.robots)
+    }
+    assert json.loads(with_schemas(header, frames)) == json.loads(
+        with_recorder(header, frames)
+    )
+
+    missiles = sum(len(m) for _, m in frames)
+    print(f"robots={args.robots} rounds={args.rounds} missile frames={missiles}")
+    for name, func in (("schemas", with_schemas), ("recorder", with_recorder)):
+        elapsed, peak = measure(func, header, frames)
+        print(f"{name:>9}: {elapsed * 1e3:8.1f} ms  peak: {peak / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
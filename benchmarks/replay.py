@@ -0,0 +1,57 @@
+import argparse
+import json
+import math
+import random
+import time
+
+import benchmarks
+from app.game import entities
+from app.game.executor import Executor
+from app.game.replay import decode_replay, encode_replay
+
+
+# Circles around the center shooting outwards, so that every robot keeps
+# moving and firing for the whole simulation
+class Patroller(entities.Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        x, y = self.get_position()
+        out = math.degrees(math.atan2(y - 500, x - 500))
+        self.drive(out + 90 + (math.dist((x, y), (500, 500)) - 200) / 5, 40)
+        self.cannon(out, 400)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Payload size of the compact replay encoding of a simulation"
+    )
+    parser.add_argument("--robots", type=int, default=4)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    header = {
+        i: {"name": f"robot{i}", "avatar_url": None, "username": "user"}
+        for i in range(args.robots)
+    }
+    for rounds in args.rounds:
+        random.seed(418)
+        e = Executor([])
+        e.robot_classes = [(i, Patroller) for i in range(args.robots)]
+        g = e.simulate(rounds)
+        assert len(g) == rounds + 1
+
+        full = g.to_json(header)
+        start = time.perf_counter()
+        compact = json.dumps(encode_replay(g, header))
+        elapsed = time.perf_counter() - start
+        assert decode_replay(json.loads(compact)) == json.loads(full)
+        print(
+            f"rounds={rounds:6} full: {len(full):9} B compact: {len(compact):8} B "
+            f"({len(full) / len(compact):5.1f}x) encode: {elapsed * 1e3:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
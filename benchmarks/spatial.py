@@ -0,0 +1,101 @@
+import argparse
+import math
+import random
+import time
+
+import benchmarks
+from app.game import *
+from app.game import entities
+from app.game.board import Board
+from app.game.explosions import explosion_damage
+from app.game.spatial import SpatialGrid
+
+
+class Wanderer(entities.Robot):
+    def initialize(self):
+        self.var = random.uniform(0, 360)
+
+    def respond(self):
+        self.var += random.uniform(-10, 10)
+        self.drive(self.var, 50)
+
+
+def random_robots(n: int):
+    robots = []
+    for i in range(n):
+        r = Wanderer(i, i, (random.uniform(0, BOARD_SZ), random.uniform(0, BOARD_SZ)))
+        r._dir = random.uniform(0, math.tau)
+        r._current_vel = r._desired_vel = random.uniform(0, 100)
+        robots.append(r)
+    return robots
+
+
+def timed(f, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f()
+    return (time.perf_counter() - start) / repeat
+
+
+def pairwise_collisions(robots):
+    for i in range(len(robots)):
+        robots[i]._move_and_check_crash(robots[:i])
+
+
+def grid_collisions(robots):
+    grid = SpatialGrid()
+    for r in robots:
+        if r._move():
+            r._check_crash(grid.near(r._pos, ROBOT_DIAMETER))
+        grid.insert(r, r._pos)
+
+
+def board_rounds_per_sec(n: int, rounds: int) -> float:
+    b = Board([(i, Wanderer) for i in range(n)])
+    elapsed = timed(b.next_round, rounds)
+    b.close()
+    return 1 / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scaling of collision and explosion lookups with the robot count"
+    )
+    parser.add_argument(
+        "--robots", type=int, nargs="+", default=[4, 50, 100, 250, 500, 1000]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'robots':>6} {'pairwise crash':>15} {'grid crash':>12} "
+        f"{'matrix boom':>12} {'grid boom':>12} {'rounds/s':>9}"
+    )
+    for n in args.robots:
+        robots = random_robots(n)
+        pairwise = timed(lambda: pairwise_collisions(robots), args.repeat)
+        grid = timed(lambda: grid_collisions(robots), args.repeat)
+
+        # One missile exploding per robot
+        missiles = [
+            (random.uniform(0, BOARD_SZ), random.uniform(0, BOARD_SZ)) for _ in range(n)
+        ]
+        robot_pos = [r._pos for r in robots]
+        matrix_boom = timed(lambda: explosion_damage(missiles, robot_pos), args.repeat)
+        grid_boom = timed(
+            lambda: explosion_damage(
+                missiles, robot_pos, SpatialGrid.from_positions(robot_pos)
+            ),
+            args.repeat,
+        )
+
+        print(
+            f"{n:>6} {pairwise * 1e3:>12.3f} ms {grid * 1e3:>9.3f} ms "
+            f"{matrix_boom * 1e3:>9.3f} ms {grid_boom * 1e3:>9.3f} ms "
+            f"{board_rounds_per_sec(n, args.rounds):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
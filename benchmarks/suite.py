@@ -0,0 +1,208 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import benchmarks
+from app.game.board import Board
+from app.game.executor import Executor
+from app.game.timing import ROUND_PHASES, PhaseTimes, enable_timing
+from benchmarks.allocations import Gunner
+from benchmarks.spatial import Wanderer
+
+# Metrics compared against a baseline, the rest are only reported
+HIGHER_IS_BETTER = {"rounds_per_sec", "games_per_sec"}
+LOWER_IS_BETTER = {"alloc_bytes_per_round"}
+SEED = 418
+
+
+def board_cases(quick: bool):
+    rabbot, loopy = benchmarks.default_robots()
+    counts = [4, 16] if quick else [2, 4, 16, 64]
+    for n in counts:
+        yield f"board/default/{n}", [(i, [rabbot, loopy][i % 2]) for i in range(n)]
+    # Synthetic robots: one never fires, the other keeps the board full of
+    # missiles
+    for n in [4, 50] if quick else [4, 50, 200]:
+        yield f"board/wanderer/{n}", [(i, Wanderer) for i in range(n)]
+        yield f"board/gunner/{n}", [(i, Gunner) for i in range(n)]
+
+
+# Best of `repeat` runs, slower runs are mostly noise from the machine
+def best_time(f, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        random.seed(SEED)
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def play(robot_classes, rounds: int) -> int:
+    b = Board(robot_classes)
+    missiles = 0
+    for _ in range(rounds):
+        b.next_round()
+        missiles += len(b.missiles)
+    b.close()
+    return missiles
+
+
+def run_board(robot_classes, rounds: int, repeat: int) -> dict:
+    elapsed = best_time(lambda: play(robot_classes, rounds), repeat)
+    random.seed(SEED)
+    missiles = play(robot_classes, rounds)
+
+    # Same game again, with every allocation traced
+    random.seed(SEED)
+    b = Board(robot_classes)
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(rounds):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        b.next_round()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - before
+    tracemalloc.stop()
+    b.close()
+
+    # And once more timing its phases
+    random.seed(SEED)
+    b = Board(robot_classes)
+    times = PhaseTimes()
+    enable_timing(b, times)
+    for _ in range(rounds):
+        b.next_round()
+    b.close()
+
+    return {
+        "rounds_per_sec": rounds / elapsed,
+        "alloc_bytes_per_round": peaks / rounds,
+        "missiles_per_round": missiles / rounds,
+        "phase_us": {p: 1e6 * times.wall[p] / rounds for p in ROUND_PHASES},
+    }
+
+
+def run_executor(robot_ids, games: int, rounds: int, repeat: int) -> dict:
+    e = Executor(robot_ids)
+    elapsed = best_time(lambda: e.execute_games(games, rounds, procs=1), repeat)
+
+    # Untimed runs above, the length of the games comes from a timed one
+    random.seed(SEED)
+    e = Executor(robot_ids, timing=True)
+    e.execute_games(games, rounds, procs=1)
+    return {
+        "games_per_sec": games / elapsed,
+        "rounds_per_game": e.times.rounds / e.games_execd,
+    }
+
+
+def run(args) -> dict:
+    rounds = 200 if args.quick else 1000
+    cases = {}
+    for name, robot_classes in board_cases(args.quick):
+        cases[name] = run_board(robot_classes, rounds, args.repeat)
+        print_case(name, cases[name])
+
+    games = 5 if args.quick else 20
+    with benchmarks.installed_default_robots() as robot_ids:
+        name = f"executor/default/{len(robot_ids)}"
+        cases[name] = run_executor(robot_ids, games, rounds, args.repeat)
+        print_case(name, cases[name])
+
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "quick": args.quick,
+        "repeat": args.repeat,
+        "cases": cases,
+    }
+
+
+def print_case(name: str, result: dict):
+    metrics = " ".join(
+        f"{k}={v:.1f}" for k, v in result.items() if isinstance(v, (int, float))
+    )
+    print(f"{name:24} {metrics}")
+    if "phase_us" in result:
+        phases = " ".join(f"{p}={us:.1f}" for p, us in result["phase_us"].items())
+        print(f"{'':24} us/round: {phases}")
+
+
+# Relative change of every compared metric, regressions are changes for the
+# worse past `threshold`
+def compare(baseline: dict, current: dict, threshold: float):
+    rows = []
+    for name, base in baseline["cases"].items():
+        cur = current["cases"].get(name)
+        if cur is None:
+            continue
+        for metric in sorted(base.keys() & cur.keys()):
+            if metric not in HIGHER_IS_BETTER | LOWER_IS_BETTER or base[metric] == 0:
+                continue
+            change = (cur[metric] - base[metric]) / base[metric]
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            rows.append(
+                (name, metric, base[metric], cur[metric], change, worse > threshold)
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Game engine benchmark suite, with baselines to compare against"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and save the results")
+    run_parser.add_argument("--out", default="benchmark-baseline.json")
+    run_parser.add_argument("--quick", action="store_true", help="fewer, smaller cases")
+    run_parser.add_argument(
+        "--repeat", type=int, default=3, help="timed runs, the best one is kept"
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="flag regressions of a run against a baseline"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="relative change, 0.1 is 10%%"
+    )
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(args)
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"saved to {args.out}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    if baseline["cpus"] != current["cpus"] or baseline["quick"] != current["quick"]:
+        print("warning: runs on different machines or settings")
+
+    rows = compare(baseline, current, args.threshold)
+    for name, metric, base, cur, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(
+            f"{name:24} {metric:22} {base:12.1f} {cur:12.1f} {100 * change:+7.1f}% {flag}"
+        )
+    regressions = sum(r[-1] for r in rows)
+    print(f"{regressions} regressions past {100 * args.threshold:.0f}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import time
+
+from app.game.board import Board
+from app.game.worker import OneShotWorker, RobotWorker
+from benchmarks import default_robots
+
+
+def rounds_per_sec(robot_classes, rounds: int, worker_factory) -> float:
+    b = Board(robot_classes, worker_factory=worker_factory)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        b.next_round()
+    elapsed = time.perf_counter() - start
+    b.close()
+    return rounds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare rounds/sec of persistent robot workers against func_timeout"
+    )
+    parser.add_argument("--robots", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    rabbot, loopy = default_robots()
+    robot_classes = [(i, [rabbot, loopy][i % 2]) for i in range(args.robots)]
+
+    one_shot = rounds_per_sec(robot_classes, args.rounds, OneShotWorker)
+    persistent = rounds_per_sec(robot_classes, args.rounds, RobotWorker)
+
+    print(f"robots={args.robots} rounds={args.rounds}")
+    print(f"func_timeout: {one_shot:10.1f} rounds/s")
+    print(f"RobotWorker:  {persistent:10.1f} rounds/s ({persistent / one_shot:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from app.game.entities import Robot
+import random
+from random import uniform
+
+
+class RandomBot(Robot):
+    def initialize(self):
+        self.dir = uniform(0, 360)
+
+    def respond(self):
+        self.dir += random.randint(-20, 20)
+        self.drive(self.dir, random.uniform(0, 50))
+        self.cannon(self.dir, 300)
@@ -0,0 +1,132 @@
+import gc
+import math
+import weakref
+from unittest import mock
+
+from app.game import *
+from app.game import entities
+from app.game.array_board import ArrayBoard, view_class
+from app.game.board import Board
+from app.game.executor import Executor
+from app.schemas.simulation import RobotInRound, Round
+from tests.testutil import ShooterBot, init_positions
+
+
+class IdBot(entities.Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        return
+
+
+class LoopBot(entities.Robot):
+    def initialize(self):
+        self.var = 0
+        return
+
+    def respond(self):
+        self.var += 90
+        self.drive(self.var, 50)
+        return
+
+
+@mock.patch(
+    "app.game.array_board.generate_init_positions", lambda n, *_: [(500, 500)] * n
+)
+def test_array_board_init():
+    b = ArrayBoard([(1, IdBot), (2, IdBot)])
+    assert len(b.robots) == 2
+    assert isinstance(b.robots[0], IdBot)
+    assert b.robots[1].get_position() == (500, 500)
+    assert b.state.pos.shape == (2, 2)
+
+
+@mock.patch(
+    "app.game.array_board.generate_init_positions", lambda n, *_: [(500, 500)] * n
+)
+def test_array_board_exec():
+    b = ArrayBoard([(1, LoopBot)])
+    g = [b.to_round_schema()]
+    for _ in range(5):
+        b.next_round()
+        g.append(b.to_round_schema())
+
+    expected_x = [500, 500, 496, 496, 503, 503]
+    expected_y = [500, 501, 501, 496, 496, 505]
+
+    expected = [
+        Round(
+            robots={b.robots[0]._board_id: RobotInRound(x=x_l, y=y_l, dmg=0)},
+            missiles={},
+        )
+        for x_l, y_l in zip(expected_x, expected_y)
+    ]
+    assert g == expected
+
+
+def test_array_board_invalid_robots():
+    class TimeoutOnInit(IdBot):
+        def initialize(self):
+            while True:
+                pass
+
+    class ExceptionOnRespond(IdBot):
+        def respond(self):
+            assert False
+
+    b = ArrayBoard([(1, TimeoutOnInit), (2, ExceptionOnRespond), (3, IdBot)])
+    assert len(b.robots) == 2
+
+    b.next_round()
+    assert len(b.robots) == 1
+    assert b.robots[0]._id == 3
+    assert b.robots[0]._slot == 0
+    assert len(b.state.pos) == 1
+
+
+@mock.patch("app.game.array_board.generate_init_positions", init_positions)
+@mock.patch("app.game.board.generate_init_positions", init_positions)
+def test_array_board_matches_board():
+    robot_classes = [(i, ShooterBot) for i in range(4)]
+    b = Board(robot_classes)
+    ab = ArrayBoard(robot_classes)
+
+    for _ in range(500):
+        assert b.to_round_schema() == ab.to_round_schema()
+        b.next_round()
+        ab.next_round()
+
+    for r, ar in zip(b.robots, ab.robots):
+        assert math.dist(r.get_position(), ar.get_position()) < 1e-6
+        assert r.get_damage() == ar.get_damage()
+
+
+def test_array_board_execute():
+    e = Executor(["test_id_bot", "test_aggressive_bot"], board=ArrayBoard)
+    with mock.patch(
+        "app.game.array_board.generate_init_positions", lambda n, *_: [(500, 500)] * n
+    ):
+        e.execute_game(1000)
+
+    assert e.survived_games["test_aggressive_bot"] == 1
+    assert e.won_games["test_aggressive_bot"] == 1
+
+
+def test_view_class_released():
+    class Dropped(entities.Robot):
+        def initialize(self):
+            pass
+
+        def respond(self):
+            pass
+
+    view = view_class(Dropped)
+    assert view_class(Dropped) is view
+    assert issubclass(view, Dropped)
+
+    # Nothing but the robot class keeps its view class
+    ref = weakref.ref(Dropped)
+    del Dropped, view
+    gc.collect()
+    assert ref() is None
@@ -31,14 +31,14 @@ def test_init_positions():
         assert all(0 < x < BOARD_SZ and 0 < y < BOARD_SZ for x, y in positions)
 
 
-@mock.patch("app.game.board.generate_init_positions", lambda n: [(500, 500)] * n)
+@mock.patch("app.game.board.generate_init_positions", lambda n, *_: [(500, 500)] * n)
 def test_board_init():
     b = Board([(1, IdBot)])
     assert len(b.robots) == 1
     assert issubclass(type(b.robots[0]), entities.Robot)
 
 
-@mock.patch("app.game.board.generate_init_positions", lambda n: [(500, 500)] * n)
+@mock.patch("app.game.board.generate_init_positions", lambda n, *_: [(500, 500)] * n)
 def test_game_missiles():
     b = Board([(1, IdBot)])
     b.missiles[1] = entities.Missile(b.robots[0]._board_id, (2000, 2000), 2, 60)
@@ -60,7 +60,7 @@ def test_game_missiles():
     assert b.robots[0].get_damage() == NEAR_EXPLOSION_DMG
 
 
-@mock.patch("app.game.board.generate_init_positions", lambda n: [(500, 500)] * n)
+@mock.patch("app.game.board.generate_init_positions", lambda n, *_: [(500, 500)] * n)
 def test_game_exec():
     b = Board([(1, LoopBot)])
     g = [b.to_round_schema()]
@@ -112,7 +112,7 @@ def test_robot_invalid_respond():
     assert len(b.robots) == 0
 
 
-@mock.patch("app.game.board.generate_init_positions", lambda n: [(500, 500)] * n)
+@mock.patch("app.game.board.generate_init_positions", lambda n, *_: [(500, 500)] * n)
 def test_game_execute():
     e = Executor(["test_id_bot", "test_aggressive_bot"])
 
@@ -120,3 +120,51 @@ def test_game_execute():
 
     assert e.survived_games["test_aggressive_bot"] == 1
     assert e.won_games["test_aggressive_bot"] == 1
+
+
+def test_games_execute_parallel():
+    e = Executor(["test_id_bot"])
+    e.execute_games(7, 100, procs=3)
+    assert e.counters() == (7, {"test_id_bot": 7}, {"test_id_bot": 7})
+
+    e = Executor(["test_id_bot", "test_aggressive_bot"])
+    e.execute_games(4, 300, procs=2)
+    games_execd, won, survived = e.counters()
+    assert games_execd == 4
+    assert sum(won.values()) <= 4
+    assert all(0 <= survived[r] <= 4 for r in e.robot_ids)
+    positions, death_counts = e.generate_stats()
+    assert sorted(positions) == sorted(e.robot_ids)
+    assert death_counts == {r: 4 - survived[r] for r in e.robot_ids}
+
+
+def test_merge_counters():
+    e = Executor(["test_id_bot", "test_aggressive_bot"])
+    e.merge_counters((3, {"test_aggressive_bot": 2}, {"test_aggressive_bot": 3}))
+    e.merge_counters((2, {"test_id_bot": 1}, {"test_id_bot": 1}))
+    assert e.generate_stats() == (
+        ["test_aggressive_bot", "test_id_bot"],
+        {"test_id_bot": 4, "test_aggressive_bot": 2},
+    )
+
+
+def test_games_checkpoint():
+    for procs in (1, 2):
+        checkpoints = []
+        e = Executor(["test_id_bot"])
+        e.execute_games(7, 10, procs, checkpoint=checkpoints.append, checkpoint_games=3)
+        assert [c[0] for c in checkpoints] == [3, 6, 7]
+        assert checkpoints[-1] == (7, {"test_id_bot": 7}, {"test_id_bot": 7})
+
+
+def test_games_early_stop():
+    for procs in (1, 2):
+        e = Executor(["test_id_bot"])
+        e.execute_games(50, 10, procs, checkpoint_games=4, stop_confidence=1)
+        assert e.stop_reason == "decided"
+        assert e.games_execd == (1 if procs == 1 else 4)
+
+    e = Executor(["test_id_bot"])
+    e.execute_games(5, 10)
+    assert e.stop_reason == "completed"
+    assert e.games_execd == 5
@@ -0,0 +1,36 @@
+import random
+
+import numpy as np
+
+from app.game import *
+from app.game.explosions import MIN_VECTORIZED_PAIRS, explosion_damage
+from benchmarks.explosions import loop_explosion_damage
+
+
+def test_explosion_bands():
+    robots = np.array([(500, 500), (500, 510), (500, 530), (500, 550)])
+    dmg = explosion_damage(np.array([(500, 500)]), robots)
+    assert dmg == [NEAR_EXPLOSION_DMG, MID_EXPLOSION_DMG, FAR_EXPLOSION_DMG, 0]
+
+
+def test_explosion_stacks():
+    missiles = np.array([(500, 500), (500, 503), (600, 600)])
+    dmg = explosion_damage(missiles, np.array([(500, 501)]))
+    assert dmg == [2 * NEAR_EXPLOSION_DMG]
+
+
+def test_explosion_empty():
+    assert explosion_damage(np.zeros((0, 2)), np.array([(1, 1)])) == [0]
+    assert explosion_damage(np.array([(1, 1)]), np.zeros((0, 2))) == []
+
+
+def test_explosion_matches_loop():
+    rng = random.Random(418)
+    assert 4 * 4 < MIN_VECTORIZED_PAIRS <= 10 * 30
+    # both below and above the size where the missile x robot matrix is used
+    for m_count, r_count in [(1, 4), (4, 4), (10, 30), (40, 100)]:
+        missiles = [(rng.uniform(0, 200), rng.uniform(0, 200)) for _ in range(m_count)]
+        robots = [(rng.uniform(0, 200), rng.uniform(0, 200)) for _ in range(r_count)]
+        expected = loop_explosion_damage(missiles, robots)
+        assert explosion_damage(missiles, robots) == expected
+        assert explosion_damage(np.array(missiles), np.array(robots)) == expected
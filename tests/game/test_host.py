@@ -0,0 +1,23 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from app.game.host import host_context, warm_up
+
+
+def process_info(_):
+    return os.getppid(), "app.game.executor" in sys.modules
+
+
+def test_forked_from_host():
+    warm_up("forkserver")
+    ctx = host_context("forkserver")
+    assert ctx.get_start_method() == "forkserver"
+
+    with ProcessPoolExecutor(2, mp_context=ctx) as pool:
+        infos = set(pool.map(process_info, range(4)))
+    # Every process comes from the same server, which already imported the
+    # game engine, not from this process
+    [(parent, preloaded)] = infos
+    assert parent != os.getpid()
+    assert preloaded
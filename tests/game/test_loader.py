@@ -0,0 +1,172 @@
+import os
+import sys
+from unittest import mock
+
+from app.game import loader as loader_module
+from app.game.loader import (
+    ROBOT_HEADER,
+    RobotLoader,
+    code_hash,
+    robot_code_path,
+    robot_compiled_path,
+)
+from app.util.check_code import check_code
+
+BOT_CODE = """from app.game.entities import Robot
+
+SPEED = {speed}
+
+
+class Bot(Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        self.drive(0, SPEED)
+"""
+
+
+def write_bot(r_id, speed):
+    src = BOT_CODE.format(speed=speed)
+    with open(robot_code_path(r_id), "w") as f:
+        f.write(src)
+    return code_hash(src.encode())
+
+
+def remove_bots(*ids):
+    for r_id in ids:
+        for path in [robot_code_path(r_id), robot_compiled_path(r_id)]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_load_cached():
+    loader = RobotLoader(size=4)
+    key = write_bot("loader_a", 10)
+    try:
+        Bot = loader.load("loader_a")
+        assert Bot.__name__ == "Bot"
+        assert key in loader
+        assert loader.load("loader_a") is Bot
+        assert Bot.__module__ not in sys.modules
+    finally:
+        remove_bots("loader_a")
+
+
+def test_load_same_code():
+    loader = RobotLoader(size=4)
+    write_bot("loader_a", 10)
+    write_bot("loader_b", 10)
+    try:
+        BotA = loader.load("loader_a")
+        BotB = loader.load("loader_b")
+        # Compiled once, but every robot keeps its own module globals
+        assert len(loader._codes) == 1
+        assert len(loader) == 2
+        assert BotA is not BotB
+        assert BotA.respond.__globals__ is not BotB.respond.__globals__
+    finally:
+        remove_bots("loader_a", "loader_b")
+
+
+def test_load_changed_code():
+    loader = RobotLoader(size=4)
+    old_key = write_bot("loader_a", 10)
+    try:
+        Old = loader.load("loader_a")
+        new_key = write_bot("loader_a", 20)
+        New = loader.load("loader_a")
+        assert New is not Old
+        assert New.respond.__globals__["SPEED"] == 20
+        assert old_key in loader and new_key in loader
+    finally:
+        remove_bots("loader_a")
+
+
+def test_forget():
+    loader = RobotLoader(size=4)
+    key = write_bot("loader_a", 10)
+    try:
+        loader.load("loader_a")
+        loader.forget("loader_a")
+        assert key not in loader
+        # Robots without code are ignored
+        loader.forget("loader_missing")
+    finally:
+        remove_bots("loader_a")
+
+
+def test_eviction():
+    loader = RobotLoader(size=2)
+    keys = [write_bot(f"loader_{i}", i) for i in range(3)]
+    try:
+        loader.load("loader_0")
+        loader.load("loader_1")
+        # Using a robot makes it the most recent one
+        loader.load("loader_0")
+        loader.load("loader_2")
+        assert len(loader) == 2
+        assert keys[0] in loader
+        assert keys[1] not in loader
+        assert keys[2] in loader
+    finally:
+        remove_bots("loader_0", "loader_1", "loader_2")
+
+
+def test_eviction_same_code():
+    loader = RobotLoader(size=2)
+    ids = [f"loader_{i}" for i in range(10)]
+    for r_id in ids:
+        key = write_bot(r_id, 10)
+    try:
+        classes = [loader.load(r_id) for r_id in ids]
+        # Robots sharing their code count one by one
+        assert len(loader) == 2
+        assert len(loader._codes) == 1
+        assert loader.load(ids[-1]) is classes[-1]
+        assert loader.load(ids[0]) is not classes[0]
+        assert key in loader
+    finally:
+        remove_bots(*ids)
+
+
+UPLOADED_CODE = b"""class Bot(Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        self.drive(0, 10)
+"""
+
+
+def test_save_precompiled():
+    loader = RobotLoader(size=4)
+    try:
+        loader.save("loader_a", UPLOADED_CODE, check_code(UPLOADED_CODE))
+        with open(robot_code_path("loader_a"), "rb") as f:
+            assert f.read() == ROBOT_HEADER + UPLOADED_CODE
+        assert os.path.exists(robot_compiled_path("loader_a"))
+
+        # Loading the robot skips compiling
+        with mock.patch.object(loader_module, "compile", create=True) as compile:
+            Bot = loader.load("loader_a")
+            compile.assert_not_called()
+        # Lines match the stored source, header included
+        assert Bot.respond.__code__.co_firstlineno == 6
+    finally:
+        remove_bots("loader_a")
+
+
+def test_stale_compiled():
+    loader = RobotLoader(size=4)
+    try:
+        loader.save("loader_a", UPLOADED_CODE, check_code(UPLOADED_CODE))
+        # Code written without going through `save`
+        key = write_bot("loader_a", 20)
+        Bot = loader.load("loader_a")
+        assert Bot.respond.__globals__["SPEED"] == 20
+        # The compiled file was replaced with the new code
+        with open(robot_compiled_path("loader_a"), "rb") as f:
+            assert bytes.fromhex(key) in f.read()
+    finally:
+        remove_bots("loader_a")
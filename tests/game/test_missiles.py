@@ -0,0 +1,40 @@
+from app.game import *
+from app.game.entities import Missile
+from app.game.missiles import MissilePool
+
+
+def test_pool_launch():
+    pool = MissilePool(2)
+    m0 = pool.launch(1, (500, 500), 0, 300)
+    m1 = pool.launch(2, (400, 400), 0, 300)
+    assert len(pool) == 2
+    assert pool[0] is m0 and pool[1] is m1
+    assert m1._sender == 2
+    assert m1._pos == (400, 400)
+    assert m1._dist == 300
+
+
+def test_pool_reuse():
+    pool = MissilePool(1)
+    m0 = pool.launch(1, (500, 500), 0, 0)
+    m1 = pool.launch(1, (500, 500), 0, 300)
+    assert len(pool) == 2
+
+    pool.remove_exploded()
+    assert len(pool) == 1
+    assert list(pool.items()) == [(1, m1)]
+
+    # The exploded missile is reused, but ids keep growing
+    m2 = pool.launch(3, (100, 200), 0, 50)
+    assert m2 is m0
+    assert [k for k, _ in pool.items()] == [1, 2]
+    assert (m2._sender, m2._pos, m2._dist) == (3, (100, 200), 50)
+
+
+def test_pool_set_missile():
+    pool = MissilePool(0)
+    pool[7] = Missile(1, (2000, 2000), 0, 10)
+    assert len(pool) == 1
+    pool[7]._advance()
+    pool.remove_exploded()
+    assert len(pool) == 0
@@ -0,0 +1,80 @@
+import json
+from unittest import mock
+
+from app.game import entities
+from app.game.array_board import ArrayBoard
+from app.game.board import Board
+from app.game.executor import Executor
+from app.game.recorder import Recorder
+from app.schemas.match import RobotInMatch
+from app.schemas.simulation import SimulationResponse
+from tests.testutil import ShooterBot, init_positions
+
+
+def test_recorder_rounds():
+    g = Recorder(2, 3)
+    g.record([(0, 10.7, 20.2, 0), (1, 30.0, 40.9, 5)], [])
+    g.record([(1, 31.5, -0.5, 5)], [(0, 1, 31.5, 40.9, False)])
+    assert len(g) == 2
+    assert [json.loads(r) for r in g.iter_rounds_json()] == [
+        {
+            "robots": {
+                "0": {"x": 10, "y": 20, "dmg": 0},
+                "1": {"x": 30, "y": 40, "dmg": 5},
+            },
+            "missiles": {},
+        },
+        {
+            "robots": {"1": {"x": 31, "y": 0, "dmg": 5}},
+            "missiles": {"0": {"sender_id": 1, "x": 31, "y": 40, "exploding": False}},
+        },
+    ]
+
+
+def test_recorder_grows_missiles():
+    g = Recorder(1, 2)
+    missiles = [(k, 0, k, k, k % 2 == 0) for k in range(10)]
+    for _ in range(3):
+        g.record([(0, 1, 1, 0)], missiles)
+    rounds = [json.loads(r) for r in g.iter_rounds_json()]
+    assert len(rounds) == 3
+    for r in rounds:
+        assert len(r["missiles"]) == 10
+        assert r["missiles"]["4"] == {"sender_id": 0, "x": 4, "y": 4, "exploding": True}
+
+
+@mock.patch("app.game.array_board.generate_init_positions", init_positions)
+@mock.patch("app.game.board.generate_init_positions", init_positions)
+def test_recorder_matches_schemas():
+    for board in (Board, ArrayBoard):
+        b = board([(i, ShooterBot) for i in range(4)])
+        g = Recorder(4, 300)
+        rounds = []
+        for _ in range(300):
+            g.record(*b.frame())
+            rounds.append(b.to_round_schema())
+            b.next_round()
+        b.close()
+        assert any(r.missiles for r in rounds)
+
+        robots = {0: RobotInMatch(name="bot", avatar_url=None, username="user")}
+        expected = SimulationResponse(robots=robots, seed=5, rounds=rounds)
+        header = {k: r.dict() for k, r in robots.items()}
+        assert json.loads(g.to_json(header, 5)) == json.loads(expected.json())
+
+
+def test_simulate_stops_early():
+    class DeadBot(entities.Robot):
+        def initialize(self):
+            return
+
+        def respond(self):
+            assert False
+
+    e = Executor([])
+    e.robot_classes = [(1, DeadBot), (2, DeadBot)]
+    g = e.simulate(100)
+    assert len(g) == 2
+    rounds = [json.loads(r) for r in g.iter_rounds_json()]
+    assert len(rounds[0]["robots"]) == 2
+    assert rounds[1] == {"robots": {}, "missiles": {}}
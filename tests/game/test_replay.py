@@ -0,0 +1,51 @@
+import json
+from unittest import mock
+
+from app.game import entities
+from app.game.executor import Executor
+from app.game.replay import decode_replay, decode_varints, encode_replay, encode_varints
+from tests.testutil import ShooterBot, init_positions
+
+
+class CrashBot(entities.Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        self.drive(0, 100)
+        return
+
+
+def test_varints():
+    values = [0, 1, -1, 15, -16, 16, -17, 100, -1000, 123456789]
+    s = encode_varints(values)
+    assert list(decode_varints(s)) == values
+    # Small deltas take a single character
+    assert len(encode_varints(list(range(-16, 16)))) == 32
+
+
+@mock.patch("app.game.board.generate_init_positions", init_positions)
+def test_replay_roundtrip():
+    e = Executor([])
+    e.robot_classes = [(i, ShooterBot) for i in range(3)] + [(3, CrashBot)]
+    recording = e.simulate(400)
+    robots = {
+        i: {"name": f"bot{i}", "avatar_url": None, "username": "u"} for i in range(4)
+    }
+    expected = json.loads(recording.to_json(robots))
+
+    for interval in (1, 7, 100):
+        replay = json.loads(json.dumps(encode_replay(recording, robots, interval)))
+        assert replay["deaths"]
+        assert replay["missiles"]
+        assert decode_replay(replay) == expected
+
+
+@mock.patch("app.game.board.generate_init_positions", init_positions)
+def test_replay_missiles_in_flight():
+    e = Executor([])
+    e.robot_classes = [(i, ShooterBot) for i in range(4)]
+    recording = e.simulate(30)
+    replay = encode_replay(recording, {})
+    assert not all(exploded for *_, exploded in replay["missiles"])
+    assert decode_replay(replay) == json.loads(recording.to_json({}))
@@ -0,0 +1,74 @@
+import random
+import threading
+from unittest import mock
+
+from app.game.array_board import ArrayBoard
+from app.game.board import Board
+from app.game.entities import Robot
+from app.game.executor import Executor
+from app.game.rng import robot_random, use
+from app.game.stalemate import is_deterministic
+
+
+def frames(recording):
+    r_end = recording.robot_offsets[recording.rounds]
+    m_end = recording.missile_offsets[recording.rounds]
+    return (
+        recording.robot_frames[:r_end].tolist(),
+        recording.missile_frames[:m_end].tolist(),
+    )
+
+
+def test_robot_random():
+    results = []
+
+    def draw():
+        use(random.Random(7))
+        results.append([robot_random.random(), robot_random.randint(0, 100)])
+
+    for _ in range(2):
+        t = threading.Thread(target=draw)
+        t.start()
+        t.join()
+    # Every thread got its own generator with the same seed
+    assert results[0] == results[1]
+
+    # Threads without a generator share the one of `random`
+    random.seed(7)
+    expected = random.random()
+    random.seed(7)
+    assert robot_random.random() == expected
+
+
+def test_seeded_simulation():
+    e = Executor(["test_random_bot", "test_random_bot", "test_aggressive_bot"])
+    assert not is_deterministic(e.robot_classes[0][1])
+
+    first = frames(e.simulate(60, seed=1234))
+    # Unseeded games and code using `random` in between change nothing
+    random.random()
+    Executor(["test_random_bot"]).simulate(10)
+    assert frames(e.simulate(60, seed=1234)) == first
+    assert frames(e.simulate(60, seed=4321)) != first
+
+    # Each robot draws its own numbers
+    robots, _ = first
+    moves = {}
+    for board_id, x, y, _ in robots:
+        moves.setdefault(board_id, []).append((x, y))
+    assert moves[0] != moves[1]
+
+
+class StillBot(Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        return
+
+
+def test_unseeded_boards_draw_no_seeds():
+    for board in (Board, ArrayBoard):
+        with mock.patch("random.getrandbits") as getrandbits:
+            board([(1, StillBot), (2, StillBot)]).close()
+        getrandbits.assert_not_called()
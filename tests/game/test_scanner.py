@@ -0,0 +1,62 @@
+import math
+import random
+
+from app.game import entities
+from app.game.scanner import MIN_VECTORIZED_SCAN_PAIRS, scan_robots
+
+
+class NoMove(entities.Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        return
+
+
+def random_robots(rng, n):
+    robots = []
+    for i in range(n):
+        r = NoMove(i, i, (rng.uniform(0, 1000), rng.uniform(0, 1000)))
+        if rng.random() < 0.8:
+            r.point_scanner(rng.uniform(0, 360), rng.uniform(0, 10))
+        robots.append(r)
+    return robots
+
+
+def test_scan_robots_matches_scan():
+    for seed, n in enumerate([3, 10, 50, 200]):
+        one_by_one = random_robots(random.Random(seed), n)
+        batched = random_robots(random.Random(seed), n)
+
+        for r in one_by_one:
+            r._scan(other._pos for other in one_by_one if other is not r)
+
+        scanning = [i for i, r in enumerate(batched) if r._scanner_params is not None]
+        scan_robots(batched, scanning)
+
+        assert [r.scanned() for r in one_by_one] == [r.scanned() for r in batched]
+        assert all(r._scanner_params is None for r in batched)
+
+    assert 3 * 3 < MIN_VECTORIZED_SCAN_PAIRS <= 50 * 40
+
+
+def test_scan_robots_edges():
+    # Same cases as `test_scan_res_underflow` and `test_scan_res_overflow`
+    robots = [NoMove(0, 0, (400, 300)), NoMove(1, 1, (600, 300))]
+    robots += [NoMove(2, 2, (800, 800))]
+    robots += [NoMove(i, i, (200, 700)) for i in range(3, 10)]
+    robots += [NoMove(10, 10, (410, 299)), NoMove(11, 11, (610, 301))]
+    robots += [NoMove(i, i, (100, 100)) for i in range(12, 20)]
+    robots[0].point_scanner(1, 10)
+    robots[1].point_scanner(356, 10)
+    robots[2].point_scanner(90, 10)
+    for r in robots[3:10]:
+        r.point_scanner(45, 1)
+
+    scan_robots(robots, list(range(10)))
+
+    assert robots[0].scanned() == math.dist((400, 300), (410, 299))
+    assert robots[1].scanned() == math.dist((600, 300), (610, 301))
+    assert robots[2].scanned() == math.inf
+    # robots in the same position are found, but never the scanning robot
+    assert all(r.scanned() == 0 for r in robots[3:10])
@@ -0,0 +1,71 @@
+import math
+import random
+
+from app.game import *
+from app.game import entities
+from app.game.board import GRID_MIN_ROBOTS_CRASH, Board
+from app.game.explosions import explosion_damage
+from app.game.spatial import SpatialGrid
+
+
+class Driver(entities.Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        return
+
+
+def random_robots(rng, n, spread):
+    robots = []
+    for i in range(n):
+        r = Driver(i, i, (rng.uniform(0, spread), rng.uniform(0, spread)))
+        r._dir = rng.uniform(0, math.tau)
+        r._current_vel = r._desired_vel = rng.uniform(0, 100)
+        robots.append(r)
+    return robots
+
+
+def test_grid_near():
+    rng = random.Random(418)
+    positions = [(rng.uniform(-50, 1050), rng.uniform(-50, 1050)) for _ in range(500)]
+    grid = SpatialGrid.from_positions(positions)
+
+    for _ in range(100):
+        pos = (rng.uniform(0, 1000), rng.uniform(0, 1000))
+        radius = rng.choice([ROBOT_DIAMETER, FAR_EXPLOSION_RADIUS])
+        found = grid.near(pos, radius)
+        assert len(found) == len(set(found))
+        assert set(found) >= {
+            i for i, p in enumerate(positions) if math.dist(pos, p) < radius
+        }
+
+
+def test_grid_collisions_match_pairwise():
+    for seed in range(5):
+        # robots are crowded so that they crash into each other and the walls
+        brute = random_robots(random.Random(seed), 300, 250)
+        gridded = random_robots(random.Random(seed), 300, 250)
+        assert len(gridded) >= GRID_MIN_ROBOTS_CRASH
+
+        for i in range(len(brute)):
+            brute[i]._move_and_check_crash(brute[:i])
+
+        b = Board([])
+        b.robots = gridded
+        b._move_robots()
+
+        assert [r._pos for r in brute] == [r._pos for r in gridded]
+        assert [r._dmg for r in brute] == [r._dmg for r in gridded]
+        assert any(r._dmg > COLLISION_DMG for r in gridded)
+
+
+def test_grid_explosions_match_pairwise():
+    rng = random.Random(418)
+    missiles = [(rng.uniform(0, 300), rng.uniform(0, 300)) for _ in range(200)]
+    robots = [(rng.uniform(0, 300), rng.uniform(0, 300)) for _ in range(200)]
+    grid = SpatialGrid.from_positions(robots)
+
+    assert explosion_damage(missiles, robots, grid) == explosion_damage(
+        missiles, robots
+    )
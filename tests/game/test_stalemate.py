@@ -0,0 +1,203 @@
+import types
+from unittest import mock
+
+from app.game import STALEMATE_ROUNDS, entities
+from app.game.board import Board
+from app.game.executor import Executor
+from app.game.stalemate import StalemateDetector
+
+
+def robot_from_source(name, src):
+    module = types.ModuleType(name)
+    module.__dict__["Robot"] = entities.Robot
+    exec(src, module.__dict__)
+    return module.Bot
+
+
+IdBot = robot_from_source(
+    "stalemate_id_bot",
+    """
+class Bot(Robot):
+    def initialize(self):
+        self.speed = 0
+
+    def respond(self):
+        self.point_scanner(90, 10)
+        self.drive(0, self.speed)
+""",
+)
+
+CounterBot = robot_from_source(
+    "stalemate_counter_bot",
+    """
+class Bot(Robot):
+    def initialize(self):
+        self.count = 0
+
+    def respond(self):
+        self.count += 1
+""",
+)
+
+GlobalCounterBot = robot_from_source(
+    "stalemate_global_counter_bot",
+    """
+count = 0
+
+class Bot(Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        global count
+        count += 1
+""",
+)
+
+ListBot = robot_from_source(
+    "stalemate_list_bot",
+    """
+class Bot(Robot):
+    def initialize(self):
+        self.seen = []
+
+    def respond(self):
+        return
+""",
+)
+
+RandomBot = robot_from_source(
+    "stalemate_random_bot",
+    """
+from random import random
+
+class Bot(Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        if random() < 1e-4:
+            self.drive(0, 50)
+""",
+)
+
+DefaultArgBot = robot_from_source(
+    "stalemate_default_arg_bot",
+    """
+class Bot(Robot):
+    def initialize(self):
+        return
+
+    def respond(self, ticks=[0]):
+        ticks[0] += 1
+        if ticks[0] > 50:
+            self.drive(0, 100)
+""",
+)
+
+ClosureBot = robot_from_source(
+    "stalemate_closure_bot",
+    """
+def counter():
+    count = 0
+
+    def tick():
+        nonlocal count
+        count += 1
+        return count
+
+    return tick
+
+tick = counter()
+
+class Bot(Robot):
+    def initialize(self):
+        return
+
+    def respond(self):
+        if tick() > 1000:
+            self.drive(0, 100)
+""",
+)
+
+SuperBot = robot_from_source(
+    "stalemate_super_bot",
+    """
+class Bot(Robot):
+    def initialize(self):
+        super().__init__
+        self.speed = 0
+
+    def respond(self, angle=90):
+        self.point_scanner(angle, 10)
+""",
+)
+
+
+def init_positions(n, *_):
+    return [(200 + 100 * i, 500) for i in range(n)]
+
+
+def rounds_until_stalemate(robot_classes, window, max_rounds=300):
+    b = Board(robot_classes)
+    s = StalemateDetector(robot_classes, window)
+    for i in range(1, max_rounds + 1):
+        b.next_round()
+        if s.update(b):
+            b.close()
+            return i
+    b.close()
+    return None
+
+
+@mock.patch("app.game.board.generate_init_positions", init_positions)
+def test_stalemate():
+    assert rounds_until_stalemate([(1, IdBot), (2, IdBot)], 10) == 11
+    assert rounds_until_stalemate([(1, IdBot), (2, IdBot)], 0) is None
+    # Plain defaults and the class cell of `super()` are no state
+    assert rounds_until_stalemate([(1, IdBot), (2, SuperBot)], 10) == 11
+
+
+@mock.patch("app.game.board.generate_init_positions", init_positions)
+def test_no_stalemate_when_state_changes():
+    for bot in (
+        CounterBot,
+        GlobalCounterBot,
+        ListBot,
+        RandomBot,
+        DefaultArgBot,
+        ClosureBot,
+    ):
+        assert rounds_until_stalemate([(1, IdBot), (2, bot)], 10) is None
+
+
+@mock.patch("app.game.board.generate_init_positions", init_positions)
+def test_no_stalemate_while_moving():
+    class Mover(IdBot):
+        def initialize(self):
+            self.speed = 10
+
+    assert rounds_until_stalemate([(1, IdBot), (2, Mover)], 10) is None
+
+
+@mock.patch("app.game.board.generate_init_positions", init_positions)
+def test_game_ends_in_stalemate():
+    e = Executor([])
+    e.robot_ids = [1, 2]
+    e.robot_classes = [(1, IdBot), (2, IdBot)]
+    e.reset_stats()
+
+    played = 0
+    next_round = Board.next_round
+
+    def counted_next_round(self):
+        nonlocal played
+        played += 1
+        next_round(self)
+
+    with mock.patch.object(Board, "next_round", counted_next_round):
+        e.execute_game(10000)
+    assert played == STALEMATE_ROUNDS + 1
+    # Same as playing every round
+    assert e.survived_games == {1: 1, 2: 1}
+    assert e.won_games == {1: 0, 2: 0}
@@ -0,0 +1,29 @@
+from app.game.stopping import is_decided, is_settled, ranking
+
+
+def test_ranking():
+    assert ranking({"a": 1, "b": 3, "c": 1}) == ["b", "a", "c"]
+
+
+def test_decided():
+    assert is_decided({"a": 60, "b": 0}, 40)
+    assert not is_decided({"a": 60, "b": 0}, 61)
+    # Ties keep the order of the robots, so `b` needs one more win than `a`
+    assert is_decided({"a": 10, "b": 5}, 5)
+    assert not is_decided({"b": 5, "a": 10}, 5)
+    # Every pair counts, not only the first place
+    assert not is_decided({"a": 50, "b": 3, "c": 2}, 5)
+    assert is_decided({"a": 50, "b": 3, "c": 2}, 0)
+    assert is_decided({"a": 7}, 100)
+
+
+def test_settled():
+    assert is_settled({"a": 20, "b": 0}, 20, 0.99)
+    assert not is_settled({"a": 20, "b": 0}, 5, 0.99)
+    assert not is_settled({"a": 11, "b": 9}, 20, 0.95)
+    # Drawn games don't count as wins of anyone
+    assert not is_settled({"a": 0, "b": 0}, 50, 0.5)
+    assert is_settled({"a": 30, "b": 10, "c": 0}, 40, 0.95)
+    assert not is_settled({"a": 30, "b": 1, "c": 0}, 40, 0.95)
+    # Only decided rankings stop with full confidence
+    assert not is_settled({"a": 100, "b": 0}, 100, 1)
@@ -0,0 +1,84 @@
+from app.game import entities
+from app.game.array_board import ArrayBoard
+from app.game.board import Board
+from app.game.executor import Executor
+from app.game.timing import GAME_PHASES, ROUND_PHASES, PhaseTimes, enable_timing
+
+
+class LoopBot(entities.Robot):
+    def initialize(self):
+        self.var = 0
+
+    def respond(self):
+        self.var += 90
+        self.drive(self.var, 50)
+        self.point_scanner(self.var, 10)
+        self.cannon(self.var, 100)
+
+
+def test_phase_times():
+    a, b = PhaseTimes(), PhaseTimes()
+    a.start()
+    a.lap("move")
+    a.add_respond(1, 0.5, 0.25)
+    b.add_respond(1, 0.5, 0.25)
+    b.add_respond(2, 1.0, 0.5)
+    b.rounds = 3
+    a.merge(b)
+    assert a.rounds == 3
+    assert a.wall["move"] >= 0
+    assert a.respond == {1: [2, 1.0, 0.5], 2: [1, 1.0, 0.5]}
+
+    summary = a.summary()
+    assert set(summary["phases"]) == set(ROUND_PHASES + GAME_PHASES)
+    assert summary["respond"]["2"] == {"calls": 1, "wall": 1.0, "cpu": 0.5}
+
+
+def test_timed_boards():
+    for board in (Board, ArrayBoard):
+        b = board([("a", LoopBot), ("b", LoopBot)])
+        # Untimed boards use the method of the class
+        assert "next_round" not in vars(b)
+
+        times = PhaseTimes()
+        enable_timing(b, times)
+        for _ in range(20):
+            b.next_round()
+        b.close()
+
+        assert times.rounds == 20
+        assert all(times.wall[p] > 0 for p in ROUND_PHASES)
+        assert {r_id: calls for r_id, (calls, _, _) in times.respond.items()} == {
+            "a": 20,
+            "b": 20,
+        }
+
+
+def test_timed_boards_same_game():
+    def frames(board, timed):
+        b = board([("a", LoopBot), ("b", LoopBot), ("c", LoopBot)], seed=3)
+        if timed:
+            enable_timing(b, PhaseTimes())
+        played = []
+        for _ in range(30):
+            b.next_round()
+            played.append(b.frame())
+        b.close()
+        return played
+
+    for board in (Board, ArrayBoard):
+        assert frames(board, True) == frames(board, False)
+
+
+def test_timed_games():
+    for procs in (1, 2):
+        e = Executor(["test_id_bot", "test_aggressive_bot"], timing=True)
+        e.execute_games(4, 10, procs)
+        assert e.games_execd == 4
+        assert 0 < e.times.rounds <= 40
+        assert e.times.wall["setup"] > 0
+        assert set(e.times.respond) == {"test_id_bot", "test_aggressive_bot"}
+
+    e = Executor(["test_id_bot"])
+    e.execute_games(2, 10)
+    assert e.times is None
@@ -0,0 +1,39 @@
+import pytest
+from func_timeout import FunctionTimedOut
+
+from app.game.worker import RobotWorker
+
+
+def test_worker_call():
+    w = RobotWorker()
+    assert w.call(1, lambda: 42) == 42
+    assert w.call(1, lambda: "again") == "again"
+    w.close()
+    w.join(1)
+    assert not w.is_alive()
+
+
+def test_worker_exception():
+    def fail():
+        assert False
+
+    w = RobotWorker()
+    with pytest.raises(AssertionError):
+        w.call(1, fail)
+    # worker survives exceptions from robot code
+    assert w.call(1, lambda: 1) == 1
+    w.close()
+
+
+def test_worker_timeout():
+    def loop():
+        while True:
+            pass
+
+    w = RobotWorker()
+    with pytest.raises(FunctionTimedOut):
+        w.call(10e-3, loop)
+    w.join(1)
+    assert not w.is_alive()
+    # closing a killed worker is harmless
+    w.close()
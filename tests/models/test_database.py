@@ -0,0 +1,98 @@
+import sqlite3
+import threading
+from unittest import mock
+
+import pytest
+from pony.orm import Database, Required, count, db_session, flush
+from pony.orm.dbapiprovider import OperationalError
+
+from app.dbconfig import db_pragmas
+from app.models.database import (
+    ADDED_COLUMNS,
+    ADDED_INDEXES,
+    add_missing_columns,
+    set_pragmas,
+)
+
+
+@pytest.mark.parametrize("journal_mode", ["wal", "delete"])
+def test_readers_during_writes(tmp_path, journal_mode):
+    # A small cache makes the writer spill its pages to the database file
+    # before committing, as the results of big matches do
+    pragmas = {"journal_mode": journal_mode, "busy_timeout": 100, "cache_size": -64}
+
+    db = Database()
+    db.on_connect(provider="sqlite")(set_pragmas)
+
+    class Row(db.Entity):
+        value = Required(str)
+
+    with mock.patch.dict(db_pragmas, pragmas):
+        db.bind(provider="sqlite", filename=str(tmp_path / "db.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+
+        with db_session:
+            Row(value="first")
+            mode = db.get_connection().execute("PRAGMA journal_mode").fetchone()
+            assert mode == (journal_mode,)
+
+        writing = threading.Event()
+        done = threading.Event()
+
+        def write():
+            with db_session:
+                for _ in range(2000):
+                    Row(value="x" * 1000)
+                flush()
+                writing.set()
+                done.wait(10)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            assert writing.wait(10)
+            with db_session:
+                if journal_mode == "wal":
+                    # Readers see the database as it was before the write
+                    assert count(r for r in Row) == 1
+                else:
+                    with pytest.raises(OperationalError, match="locked"):
+                        count(r for r in Row)
+        finally:
+            done.set()
+            writer.join()
+
+        with db_session:
+            assert count(r for r in Row) == 2001
+    db.disconnect()
+
+
+def test_add_missing_columns(tmp_path):
+    filename = str(tmp_path / "db.sqlite")
+    # Match as the first release created it
+    with sqlite3.connect(filename) as con:
+        con.execute(
+            'CREATE TABLE "Match" '
+            '("id" INTEGER PRIMARY KEY, "name" VARCHAR(32), "state" VARCHAR(8))'
+        )
+        con.execute("INSERT INTO \"Match\" VALUES (1, 'old', 'Lobby')")
+        con.execute(
+            'CREATE TABLE "RobotMatchResult" '
+            '("id" INTEGER PRIMARY KEY, "robot_id" INTEGER, "match_id" INTEGER)'
+        )
+
+    db = Database()
+    db.bind(provider="sqlite", filename=filename)
+    add_missing_columns(db)
+    # Columns already there are left alone
+    add_missing_columns(db)
+
+    with db_session:
+        columns = [c[1] for c in db.execute('PRAGMA table_info("Match")')]
+        assert columns == ["id", "name", "state", *ADDED_COLUMNS["Match"]]
+        assert db.select('* FROM "Match"') == [(1, "old", "Lobby", None, None, None)]
+
+        indexes = db.select("name FROM sqlite_master WHERE type = 'index'")
+        for table_indexes in ADDED_INDEXES.values():
+            assert set(table_indexes) <= set(indexes)
+    db.disconnect()
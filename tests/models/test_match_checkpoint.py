@@ -0,0 +1,18 @@
+from pony.orm import db_session
+
+from app.models import MatchCheckpoint, db
+
+
+@db_session
+def test_checkpoint_model():
+    MatchCheckpoint(
+        match_id=1,
+        games_played=10,
+        won_games={"1": 4, "2": 6},
+        survived_games={"1": 5, "2": 7},
+    )
+    c = MatchCheckpoint.get(match_id=1)
+    assert c.games_played == 10
+    assert c.won_games == {"1": 4, "2": 6}
+
+    db.rollback()
@@ -0,0 +1,12 @@
+from pony.orm import db_session
+
+from app.models import MatchTimings, db
+
+
+@db_session
+def test_timings_model():
+    summary = {"rounds": 10, "phases": {"move": {"wall": 0.5, "cpu": 0.25}}}
+    MatchTimings(match_id=1, timings=summary)
+    assert MatchTimings.get(match_id=1).timings == summary
+
+    db.rollback()
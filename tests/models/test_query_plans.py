@@ -0,0 +1,32 @@
+from pony.orm import db_session, select
+
+from app.models import Match, RobotMatchResult, db
+
+
+# Plan SQLite picks for the SQL of a Pony query, one detail per step
+def query_plan(query) -> str:
+    sql = query.get_sql()
+    cursor = db.get_connection().execute(
+        f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count("?")
+    )
+    return "\n".join(row[-1] for row in cursor)
+
+
+@db_session
+def test_listing_plan():
+    lobbies = select(m for m in Match if m.state == "Lobby").order_by(Match.id)
+    assert "idx_match__state_id" in query_plan(lobbies)
+
+    hosted = select(m for m in Match if m.host.name == "leo")
+    assert "idx_match__host" in query_plan(hosted)
+
+
+@db_session
+def test_result_plan():
+    ids = [1, 2]
+    by_match = select(r for r in RobotMatchResult if r.match_id in ids)
+    assert "idx_robotmatchresult__match_id" in query_plan(by_match)
+
+    # Lookups by robot use the index of the (robot_id, match_id) key
+    by_robot = select(r for r in RobotMatchResult if r.robot_id == 1)
+    assert "USING INDEX sqlite_autoindex_RobotMatchResult_1" in query_plan(by_robot)
@@ -1,3 +1,4 @@
+import math
 import random
 import string
 from urllib.parse import quote_plus
@@ -5,6 +6,7 @@ from urllib.parse import quote_plus
 from fastapi.testclient import TestClient
 from pony.orm import commit, db_session
 
+from app.game import entities
 from app.main import app
 from app.models.match import Match
 from app.models.robot import Robot
@@ -14,6 +16,27 @@ from app.util.auth import get_current_user
 cl = TestClient(app)
 
 
+# Robot that keeps moving, scanning and firing, games with a few of them go
+# through every phase of a round
+class ShooterBot(entities.Robot):
+    def initialize(self):
+        self.var = self._board_id * 37
+        return
+
+    def respond(self):
+        self.var += 7
+        if self.scanned() < 700:
+            self.cannon(self.var, self.scanned())
+        self.point_scanner(self.var, 10)
+        self.drive(self.var, 40 + self.var % 60)
+        return
+
+
+# Robots close together, in range of each other
+def init_positions(n, *_):
+    return [(500 + 30 * math.cos(i), 500 + 30 * math.sin(i)) for i in range(n)]
+
+
 def test_must_fail():
     assert False
 
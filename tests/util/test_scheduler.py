@@ -0,0 +1,49 @@
+import threading
+
+from app.util.scheduler import MatchScheduler
+
+
+def test_scheduler_queue():
+    release = threading.Event()
+    started = []
+
+    def job(match_id):
+        started.append(match_id)
+        release.wait()
+
+    s = MatchScheduler(job, workers=1)
+    assert s.submit(1)
+    assert s.submit(2)
+    # Already queued
+    assert not s.submit(2)
+
+    while not started:
+        release.wait(0.01)
+    report = s.report()
+    assert report["workers"] == 1
+    assert report["running"] == 1
+    assert report["queued"] == 1
+    assert report["oldest_wait"] > 0
+
+    release.set()
+    s.join()
+    assert started == [1, 2]
+    report = s.report()
+    assert report["queued"] == 0 and report["running"] == 0
+    assert report["finished"] == 2
+    assert report["failed"] == 0
+
+
+def test_scheduler_failed_match(caplog):
+    def job(match_id):
+        raise RuntimeError("boom")
+
+    s = MatchScheduler(job, workers=1)
+    s.submit(7)
+    s.join()
+    report = s.report()
+    assert report["finished"] == 0
+    assert report["failed"] == 1
+    [record] = [r for r in caplog.records if r.name == "app.util.scheduler"]
+    assert record.getMessage() == "Match 7 failed"
+    assert record.exc_info[0] is RuntimeError
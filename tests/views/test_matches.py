@@ -1,12 +1,22 @@
 from datetime import timedelta
+from unittest import mock
 
+import pytest
 from fastapi.testclient import TestClient
 from pony.orm import commit, db_session
 
 from app.main import app
-from app.models import Match, Robot, RobotMatchResult
+from app.models import Match, MatchCheckpoint, MatchTimings, Robot, RobotMatchResult
+from app.models.database import db
 from app.util.auth import create_access_token
+from app.util.db_access import (
+    load_match_checkpoint,
+    match_id_to_schema,
+    matches_to_schemas,
+    save_match_checkpoint,
+)
 from app.util.errors import *
+from app.views.matches import execute_match, resume_matches, scheduler
 from tests.testutil import (
     create_random_matches,
     create_random_robots,
@@ -166,6 +176,8 @@ def test_get_created():
                 },
                 "state": "Lobby",
                 "results": None,
+                "games_played": None,
+                "stop_reason": None,
             },
             {
                 "name": m2.name,
@@ -185,6 +197,8 @@ def test_get_created():
                 },
                 "state": "Lobby",
                 "results": None,
+                "games_played": None,
+                "stop_reason": None,
             },
         ]
 
@@ -378,6 +392,37 @@ def test_join_match():
     assert len(data) == len(set(m["id"] for m in data))
 
 
+def test_get_matches_pages():
+    host, user = register_random_users(2)
+    matches = create_random_matches(host["token"], 5)
+    ids = [int(m["id"]) for m in matches]
+    tok_header = {"token": user["token"]}
+
+    with db_session:
+        Match[ids[0]].password = ""
+        Match[ids[1]].max_players = 1
+        Match[ids[2]].min_players = 3
+        Match[ids[3]].name = "Prefix" + Match[ids[3]].name
+        commit()
+
+    def public(query=""):
+        url = f"/matches/?match_type=public&after={ids[0] - 1}{query}"
+        response = cl.get(url, headers=tok_header)
+        assert response.status_code == 200
+        return [m["id"] for m in response.json() if m["id"] in ids]
+
+    assert public() == ids
+    assert public("&limit=2") == ids[:2]
+    assert public(f"&limit=2&after={ids[1]}") == ids[2:4]
+    assert public("&private=false") == ids[:1]
+    assert public("&private=true") == ids[1:]
+    assert public("&free_slots=false") == ids[1:2]
+    assert public("&free_slots=true") == ids[:1] + ids[2:]
+    assert public("&min_players=3") == ids[2:3]
+    assert public("&max_players=1") == ids[1:2]
+    assert public("&name=Prefix") == ids[3:4]
+
+
 def test_join_matches_replacing_robot():
     users = register_random_users(2)
     match = create_random_matches(users[0]["token"], 1)[0]
@@ -558,6 +603,7 @@ def test_start_match():
     response = cl.put("/matches/1/start/", headers=tok_header)
 
     assert response.status_code == 201
+    scheduler.join()
 
     with db_session:
         assert RobotMatchResult.exists(robot_id=robots[0]["id"], match_id=1)
@@ -607,6 +653,181 @@ def test_start_match_already_started():
     assert data["detail"] == MATCH_STARTED_ERROR.detail
 
 
+def test_resume_matches():
+    users = register_random_users(1)
+    match = create_random_matches(users[0]["token"], 1)[0]
+
+    with db_session:
+        Match[match["id"]].state = "InGame"
+        commit()
+
+    resume_matches()
+    scheduler.join()
+
+    with db_session:
+        assert Match[match["id"]].state == "Finished"
+
+
+def test_resume_from_checkpoint():
+    users = register_random_users(1)
+    match = create_random_matches(users[0]["token"], 1)[0]
+
+    with db_session:
+        m = Match[match["id"]]
+        m.state = "InGame"
+        m.game_count = 5
+        m.round_count = 10
+        [robot_id] = [r.id for r in m.plays]
+        commit()
+
+    # A lone robot survives every game, the 2 deaths come from the checkpoint
+    save_match_checkpoint(match["id"], (3, {robot_id: 3}, {robot_id: 1}))
+    assert load_match_checkpoint(match["id"], [robot_id]) == (
+        3,
+        {robot_id: 3},
+        {robot_id: 1},
+    )
+
+    resume_matches()
+    scheduler.join()
+
+    with db_session:
+        assert Match[match["id"]].state == "Finished"
+        result = RobotMatchResult.get(robot_id=robot_id, match_id=match["id"])
+        assert result.death_count == 2
+        assert MatchCheckpoint.get(match_id=match["id"]) is None
+
+
+def test_match_early_stop():
+    users = register_random_users(1)
+    match = create_random_matches(users[0]["token"], 1)[0]
+
+    with db_session:
+        m = Match[match["id"]]
+        m.state = "InGame"
+        m.game_count = 20
+        m.round_count = 10
+        m.stop_confidence = 1
+        commit()
+
+    resume_matches()
+    scheduler.join()
+
+    response = cl.get(f"/matches/{match['id']}/", headers={"token": users[0]["token"]})
+    data = response.json()
+    assert data["state"] == "Finished"
+    # A lone robot has won the match after the first game
+    assert data["games_played"] == 1
+    assert data["stop_reason"] == "decided"
+
+
+def test_match_finished_atomically():
+    users = register_random_users(1)
+    match = create_random_matches(users[0]["token"], 1)[0]
+
+    with db_session:
+        m = Match[match["id"]]
+        m.state = "InGame"
+        m.game_count = 2
+        m.round_count = 10
+        [robot_id] = [r.id for r in m.plays]
+        commit()
+
+    # Failing halfway through the finalization leaves the match as it was
+    with mock.patch("app.views.matches.MatchCheckpoint") as checkpoint:
+        checkpoint.get.side_effect = RuntimeError
+        with pytest.raises(RuntimeError):
+            execute_match(match["id"])
+        checkpoint.get.assert_called_once_with(match_id=match["id"])
+
+    with db_session:
+        assert Match[match["id"]].state == "InGame"
+        assert not RobotMatchResult.exists(match_id=match["id"])
+        assert Robot[robot_id].played_matches == 0
+        assert MatchCheckpoint.get(match_id=match["id"]).games_played == 2
+
+    # Resumed from the checkpoint saved after the last game
+    execute_match(match["id"])
+
+    with db_session:
+        assert Match[match["id"]].state == "Finished"
+        assert RobotMatchResult.exists(robot_id=robot_id, match_id=match["id"])
+        robot = Robot[robot_id]
+        assert (robot.played_matches, robot.won_matches, robot.mmr) == (1, 1, 20)
+
+
+def test_match_timings():
+    users = register_random_users(1)
+    match = create_random_matches(users[0]["token"], 1)[0]
+
+    with db_session:
+        m = Match[match["id"]]
+        m.state = "InGame"
+        m.game_count = 3
+        m.round_count = 10
+        commit()
+
+    with mock.patch("app.views.matches.MATCH_TIMING", True):
+        resume_matches()
+        scheduler.join()
+
+    with db_session:
+        timings = MatchTimings[match["id"]].timings
+        robot_ids = [str(r.id) for r in Match[match["id"]].plays]
+    assert timings["rounds"] > 0
+    assert timings["phases"]["respond"]["wall"] > 0
+    assert list(timings["respond"]) == robot_ids
+
+
+def test_matches_to_schemas():
+    users = register_random_users(3)
+    matches = []
+    for u in users:
+        matches += create_random_matches(u["token"], 4)
+    ids = [int(m["id"]) for m in matches]
+
+    with db_session:
+        for m_id in ids[::2]:
+            m = Match[m_id]
+            m.state = "Finished"
+            for r in m.plays:
+                RobotMatchResult(
+                    robot_id=r.id, match_id=m_id, position=1, death_count=2
+                )
+        commit()
+
+    def count_queries(match_ids):
+        with mock.patch.object(db, "_exec_sql", wraps=db._exec_sql) as exec_sql:
+            schemas = matches_to_schemas(match_ids)
+        return schemas, exec_sql.call_count
+
+    schemas, many = count_queries(ids[::-1] + [-1])
+    _, one = count_queries(ids[:1])
+    assert many == one
+
+    # In the order asked for, missing matches left out, same as one at a time
+    assert [s.id for s in schemas] == ids[::-1]
+    assert schemas == [match_id_to_schema(m_id) for m_id in ids[::-1]]
+    assert schemas[-1].results is not None
+    assert schemas[-2].results is None
+
+
+def test_get_match_queue():
+    [user] = register_random_users(1)
+
+    response = cl.get("/matches/queue/", headers={"token": user["token"]})
+    assert response.status_code == 200
+    assert set(response.json()) == {
+        "workers",
+        "queued",
+        "running",
+        "finished",
+        "failed",
+        "oldest_wait",
+        "average_wait",
+    }
+
+
 def test_start_match_unowned_robot():
     users = register_random_users(2)
     match = create_random_matches(users[0]["token"], 1)[0]
@@ -4,8 +4,10 @@ from urllib.parse import quote_plus
 from fastapi.testclient import TestClient
 from pony.orm import db_session
 
+from app.game.loader import robot_loader
 from app.main import app
 from app.models import Robot
+from app.views.matches import scheduler
 from app.views.users import create_access_token
 from tests.testutil import (
     create_random_matches,
@@ -236,9 +238,34 @@ def test_get_robots():
         ],
     ]
 
+    # Listed by id
     for i, r in enumerate(test_robots):
         response = cl.get("/robots/", headers={"token": users[i]["token"]})
-        assert response.json() == r
+        assert response.json() == sorted(r, key=lambda robot: robot["robot_id"])
+
+
+def test_get_robots_pages():
+    [user] = register_random_users(1)
+    tok_header = {"token": user["token"]}
+    create_random_robots(user["token"], 3)
+
+    all_ids = [r["robot_id"] for r in cl.get("/robots/", headers=tok_header).json()]
+    assert len(all_ids) == 5
+
+    ids = []
+    after = ""
+    while True:
+        response = cl.get(f"/robots/?limit=2{after}", headers=tok_header)
+        page = [r["robot_id"] for r in response.json()]
+        if not page:
+            break
+        assert len(page) <= 2
+        ids += page
+        after = f"&after={page[-1]}"
+    assert ids == all_ids
+
+    response = cl.get("/robots/?limit=0", headers=tok_header)
+    assert response.status_code == 422
 
 
 def test_robot_results():
@@ -260,6 +287,7 @@ def test_robot_results():
 
     host_token_header = {"token": host["token"]}
     response = cl.put(f"/matches/{match['id']}/start/", headers=host_token_header)
+    scheduler.join()
     assert response.status_code == 201
 
     match_result = cl.get(f"/matches/{match['id']}/", headers=host_token_header).json()
@@ -329,11 +357,18 @@ def test_update_robot_code():
     )
     assert response.status_code == 418
 
+    OldBot = robot_loader.load(1)
+
     response = cl.put(
         "/robots/1/", headers={"token": user1["token"]}, json={"code": new_code}
     )
     assert response.status_code == 200
 
+    # Matches started from now on run the new code
+    NewBot = robot_loader.load(1)
+    assert NewBot is not OldBot
+    assert NewBot.__name__ == "IdBot"
+
     response = cl.get("/robots/1/", headers={"token": user1["token"]})
     assert response.status_code == 200
     assert response.json()["code"] == new_code
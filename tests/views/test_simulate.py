@@ -1,7 +1,11 @@
+import json
+from unittest import mock
 from urllib.parse import quote_plus
 
 from fastapi.testclient import TestClient
 
+from app.game.executor import Executor
+from app.game.replay import decode_replay
 from app.main import app
 from app.util.assets import ASSETS_DIR
 
@@ -149,3 +153,148 @@ def test_run_simulation():
             }
             for i, r in enumerate(s[1])
         }
+
+
+def test_stream_simulation():
+    user = {
+        "username": "streamer",
+        "password": "AlpacaTactica158",
+        "email": "streamer@gemail.com",
+    }
+
+    response = cl.post(f"/users/{json_to_queryparams(user)}")
+    assert response.status_code == 201
+
+    login_data = {"username": user["username"], "password": user["password"]}
+    response = cl.post("/users/login/", json=login_data)
+    assert response.status_code == 200
+    token = response.json()["token"]
+
+    code = open(f"{ASSETS_DIR}/defaults/code/test_loop_bot.py")
+    response = cl.post(
+        "/robots/?name=lueme", headers={"token": token}, files=[("code", code)]
+    )
+    assert response.status_code == 201
+
+    response = cl.get("/robots/", headers={"token": token})
+    [lueme] = [r for r in response.json() if r["name"] == "lueme"]
+
+    response = cl.post(
+        "/simulate/stream/",
+        headers={"token": token},
+        json={"rounds": 55, "robots": [lueme["robot_id"], lueme["robot_id"]]},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["robots"] == {
+        str(i): {"name": "lueme", "avatar_url": None, "username": "streamer"}
+        for i in range(2)
+    }
+    assert isinstance(lines[0]["seed"], int)
+    assert len(lines) == 1 + 56
+    assert all(set(r) == {"robots", "missiles"} for r in lines[1:])
+
+    response = cl.post(
+        "/simulate/",
+        headers={"token": token},
+        json={"rounds": 55, "robots": [lueme["robot_id"]], "compact": True},
+    )
+    assert response.status_code == 200
+    data = decode_replay(response.json())
+    assert data["robots"] == {
+        "0": {"name": "lueme", "avatar_url": None, "username": "streamer"}
+    }
+    assert len(data["rounds"]) == 56
+
+    response = cl.post(
+        "/simulate/stream/",
+        headers={"token": token},
+        json={"rounds": 10, "robots": [4638]},
+    )
+    assert response.status_code == 404
+
+
+def test_seeded_simulation():
+    user = {
+        "username": "seeder",
+        "password": "S33ds are n1ce",
+        "email": "seeder@gemail.com",
+    }
+
+    response = cl.post(f"/users/{json_to_queryparams(user)}")
+    assert response.status_code == 201
+
+    login_data = {"username": user["username"], "password": user["password"]}
+    response = cl.post("/users/login/", json=login_data)
+    token = response.json()["token"]
+
+    code = open(f"{ASSETS_DIR}/robots/code/test_random_bot.py", "rb")
+    code.readline()  # uploaded code comes without the `Robot` import
+    response = cl.post(
+        "/robots/?name=dice", headers={"token": token}, files=[("code", code)]
+    )
+    assert response.status_code == 201
+
+    response = cl.get("/robots/", headers={"token": token})
+    [dice] = [r for r in response.json() if r["name"] == "dice"]
+    robots = [dice["robot_id"], dice["robot_id"]]
+
+    response = cl.post(
+        "/simulate/", headers={"token": token}, json={"rounds": 40, "robots": robots}
+    )
+    assert response.status_code == 200
+    seed = response.json()["seed"]
+    assert isinstance(seed, int)
+
+    # Games with a seed drawn by the server are not kept
+    with mock.patch("app.views.simulate.cache_simulation") as cache_simulation:
+        response = cl.post(
+            "/simulate/",
+            headers={"token": token},
+            json={"rounds": 40, "robots": robots},
+        )
+        cache_simulation.assert_not_called()
+    assert response.json()["seed"] != seed
+
+    # The same seed gives back the same game, from the cache the second time
+    request = {"rounds": 40, "robots": robots, "seed": 99}
+    response = cl.post("/simulate/", headers={"token": token}, json=request)
+    first = response.json()
+    assert first["seed"] == 99
+    with mock.patch.object(Executor, "simulate_iter") as simulate_iter:
+        response = cl.post("/simulate/", headers={"token": token}, json=request)
+        simulate_iter.assert_not_called()
+    assert response.json() == first
+
+    response = cl.post("/simulate/stream/", headers={"token": token}, json=request)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["seed"] == 99
+    assert lines[1:] == first["rounds"]
+
+    # Streams are recorded for the cache only with a seed from the client
+    with mock.patch("app.views.simulate.Recorder") as recorder:
+        response = cl.post(
+            "/simulate/stream/",
+            headers={"token": token},
+            json={"rounds": 30, "robots": robots},
+        )
+        # The robots, the starting positions and every round
+        assert len(response.text.splitlines()) == 32
+        recorder.assert_not_called()
+
+    request = {"rounds": 30, "robots": robots, "seed": 7}
+    response = cl.post("/simulate/stream/", headers={"token": token}, json=request)
+    streamed = [json.loads(line) for line in response.text.splitlines()[1:]]
+    with mock.patch.object(Executor, "simulate_iter") as simulate_iter:
+        response = cl.post("/simulate/", headers={"token": token}, json=request)
+        simulate_iter.assert_not_called()
+    assert response.json()["rounds"] == streamed
+
+    response = cl.post(
+        "/simulate/",
+        headers={"token": token},
+        json={"rounds": 40, "robots": robots, "seed": -1},
+    )
+    assert response.status_code == 422
@@ -6,6 +6,7 @@ from urllib.parse import quote_plus
 from fastapi.testclient import TestClient
 from pony.orm import db_session
 
+from app.game.loader import robot_compiled_path
 from app.main import app
 from app.models.robot import Robot
 from app.models.user import User
@@ -246,17 +247,17 @@ def test_default_robots():
 
     expected_result = [
         {
-            "robot_id": 2,
-            "name": "LooPy",
-            "avatar_url": "/assets/avatars/robot/2.png",
+            "robot_id": 1,
+            "name": "Rabbot",
+            "avatar_url": "/assets/avatars/robot/1.png",
             "won_matches": 0,
             "played_matches": 0,
             "mmr": 0,
         },
         {
-            "robot_id": 1,
-            "name": "Rabbot",
-            "avatar_url": "/assets/avatars/robot/1.png",
+            "robot_id": 2,
+            "name": "LooPy",
+            "avatar_url": "/assets/avatars/robot/2.png",
             "won_matches": 0,
             "played_matches": 0,
             "mmr": 0,
@@ -269,6 +270,8 @@ def test_default_robots():
     assert path.exists(f"{ASSETS_DIR}/robots/code/1.py") and path.exists(
         f"{ASSETS_DIR}/robots/code/2.py"
     )
+    # Stored with their compiled code, like uploaded robots
+    assert path.exists(robot_compiled_path(1)) and path.exists(robot_compiled_path(2))
     assert path.exists(f"{ASSETS_DIR}/robots/avatars/1.png") and path.exists(
         f"{ASSETS_DIR}/robots/avatars/2.png"
     )
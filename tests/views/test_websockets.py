@@ -3,6 +3,7 @@ from fastapi import websockets
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.views.matches import scheduler
 from tests.testutil import (
     create_random_matches,
     create_random_robots,
@@ -99,6 +100,7 @@ def test_websocket_finished_connect():
     cl.put(f"/matches/{match['id']}/join/", headers=tok_headers[1], json=json_form)
 
     cl.put(f"/matches/{match['id']}/start/", headers=tok_headers[0])
+    scheduler.join()
 
     with cl.websocket_connect(f"/matches/{match['id']}/ws") as ws:
         response = ws.receive_json()